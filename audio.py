@@ -0,0 +1,133 @@
+import os
+import threading
+import pygame
+
+# All sound goes through one AudioManager: the mixer is set up once, short
+# effects are decoded into memory on a background thread at startup, and
+# every effect plays on a fixed pool of channels. When the pool is full a new
+# sound takes over the least important (then oldest) voice, or is dropped if
+# everything playing matters more, so a burst of impacts never waits on a
+# channel or piles up.
+ASSET_DIR = "assets"
+# frequency, sample size, output channels, buffer samples (~12 ms at 44.1 kHz:
+# low latency for effects without underrunning on slow machines)
+MIXER_SETTINGS = (44100, -16, 2, 512)
+CHANNEL_COUNT = 16
+MUSIC_FILE = "background_music.mp3"
+MUSIC_VOLUME = 0.4
+MIN_REPEAT_MS = 40  # The same effect isn't restarted faster than this
+
+# name -> (file in assets/, volume, priority); higher priority steals from lower
+SOUND_EFFECTS = {
+    "intro_roar": ("Intro_Roar.mp3", 0.7, 3),  # Loaded first: it plays on the start click
+    "explosion": ("explosion.wav", 0.5, 1),
+    "hit": ("hit.wav", 0.3, 0),
+}
+
+_asset_names = None
+
+def find_asset(filename, directory=ASSET_DIR):
+    # Asset file names don't always match the case used in code
+    # (e.g. Background_music.mp3), which matters on case-sensitive file systems
+    global _asset_names
+    path = os.path.join(directory, filename)
+    if os.path.exists(path):
+        return path
+    if _asset_names is None:
+        try:
+            _asset_names = {name.lower(): name for name in os.listdir(directory)}
+        except OSError:
+            _asset_names = {}
+    name = _asset_names.get(filename.lower())
+    return os.path.join(directory, name) if name else None
+
+class AudioManager:
+    def __init__(self, channels=CHANNEL_COUNT):
+        # Nothing is opened here; start() does that once the menu is on screen
+        self.channel_count = channels
+        self.sounds = {}  # name -> Sound, filled in by the loader thread
+        self.enabled = False
+        self.music_wanted = False  # play_music() was called before start()
+
+    def start(self):
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(*MIXER_SETTINGS)
+            pygame.mixer.set_num_channels(self.channel_count)
+        except pygame.error as e:
+            print(f"Audio disabled: {e}")
+            return
+        self.enabled = True
+        self.channels = [pygame.mixer.Channel(index) for index in range(self.channel_count)]
+        self.voice_priority = [0] * self.channel_count
+        self.voice_started = [0] * self.channel_count
+        self.last_played = {}  # name -> start time, for MIN_REPEAT_MS
+        self.loader = threading.Thread(target=self._preload, name="sound-loader", daemon=True)
+        self.loader.start()
+        self.load_music()
+        if self.music_wanted:
+            self.play_music()
+
+    def _preload(self):
+        # Decoding MP3/WAV into memory is slow; doing it here keeps the window responsive
+        for name, (filename, volume, _) in SOUND_EFFECTS.items():
+            path = find_asset(filename)
+            if path is None:
+                print(f"Sound not found: {filename}")
+                continue
+            try:
+                sound = pygame.mixer.Sound(path)
+                sound.set_volume(volume)
+                self.sounds[name] = sound
+            except pygame.error as e:
+                print(f"Error loading sound {filename}: {e}")
+
+    def wait_until_loaded(self, timeout=None):
+        if self.enabled:
+            self.loader.join(timeout)
+
+    def play(self, name):
+        # Returns the Sound that started, or None if it was skipped. Never blocks:
+        # a sound that hasn't finished loading is simply not played.
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        now = pygame.time.get_ticks()
+        if now - self.last_played.get(name, -MIN_REPEAT_MS) < MIN_REPEAT_MS:
+            return None
+        priority = SOUND_EFFECTS[name][2]
+
+        channels = self.channels
+        index = next((index for index, channel in enumerate(channels) if not channel.get_busy()), None)
+        if index is None:
+            # Pool is full: steal the least important voice, oldest first
+            index = min(range(len(channels)), key=lambda i: (self.voice_priority[i], self.voice_started[i]))
+            if self.voice_priority[index] > priority:
+                return None
+        channels[index].play(sound)
+        self.voice_priority[index] = priority
+        self.voice_started[index] = now
+        self.last_played[name] = now
+        return sound
+
+    def load_music(self):
+        if not self.enabled:
+            return
+        path = find_asset(MUSIC_FILE)
+        try:
+            if path is None:
+                raise FileNotFoundError(f"No file '{MUSIC_FILE}' in '{ASSET_DIR}'")
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(MUSIC_VOLUME)
+            print("Background music loaded successfully")
+        except Exception as e:
+            print(f"Error loading background music: {e}")
+
+    def play_music(self):
+        self.music_wanted = True
+        if not self.enabled:
+            return
+        try:
+            pygame.mixer.music.play(-1)  # -1 means loop indefinitely
+        except pygame.error as e:
+            print(f"Error playing background music: {e}")
@@ -0,0 +1,253 @@
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from maps import MAPS, DEFAULT_MAP
+from memory_profile import resident_kb
+from placement_optimizer import candidate_positions
+from simulation import HeadlessSimulation, fork_map
+from tower import TOWER_TYPES
+from unit_stats import MAX_WAVES
+
+# Plays whole games unattended for soak and performance testing. A strategy
+# buys and sells towers through the same GameManager calls a player's clicks
+# go through (buy_tower, sell_tower, start_wave); auto skip is on, so waves run
+# back to back, and nothing caps the frame rate. Every wave is measured: time
+# per frame, the busiest the board got, and memory at the end of the wave.
+#
+# Headless by default (the GameManager on a simulated clock, many games in
+# parallel with --workers). --render plays through the real Game window,
+# drawing every frame.
+DECISION_TICKS = 30  # Strategies look at the board twice a second of game time
+SELL_CHANCE = 0.02  # How often the random strategy sells a tower when it decides...
+MIN_TOWERS_TO_SELL = 5  # ...once it has at least this many
+RANDOM_SPOTS = 40  # The random strategy picks among this many spots nearest a lane
+
+class Strategy:
+    # Decides what to buy and sell. act() runs when a game starts, whenever a
+    # wave starts and every DECISION_TICKS ticks in between; on its own a
+    # strategy buys nothing, which makes an undefended baseline run.
+    name = "idle"
+
+    def __init__(self, game_manager, rng):
+        self.rng = rng
+        self.spots = candidate_positions(game_manager)  # Nearest a lane first
+
+    def act(self, game_manager):
+        pass
+
+    def affordable(self, game_manager):
+        return [tower_class for tower_class in TOWER_TYPES.values() if tower_class.stats.cost <= game_manager.cash]
+
+    def place(self, game_manager, tower_class):
+        # First free spot, nearest the enemies first
+        if len(game_manager.towers) >= game_manager.max_towers:
+            return False
+        return any(game_manager.buy_tower(tower_class, spot) for spot in self.spots)
+
+class GreedyStrategy(Strategy):
+    # Always the most expensive tower it can afford, as close to a lane as possible
+    name = "greedy"
+
+    def act(self, game_manager):
+        while True:
+            options = self.affordable(game_manager)
+            if not options or not self.place(game_manager, max(options, key=lambda tower_class: tower_class.stats.cost)):
+                return
+
+class RandomStrategy(Strategy):
+    # Random towers in random spots, now and then selling one again
+    name = "random"
+
+    def act(self, game_manager):
+        if len(game_manager.towers) >= MIN_TOWERS_TO_SELL and self.rng.random() < SELL_CHANCE:
+            tower = self.rng.choice(game_manager.towers)
+            game_manager.sell_tower(tower.position)
+        options = self.affordable(game_manager)
+        if options and len(game_manager.towers) < game_manager.max_towers:
+            spot = self.rng.choice(self.spots[:RANDOM_SPOTS])
+            game_manager.buy_tower(self.rng.choice(options), spot)
+
+class UpgradeStrategy(GreedyStrategy):
+    # Greedy, and once the tower limit is reached it sells its cheapest tower
+    # whenever the refund buys something more expensive in its place
+    name = "upgrade"
+
+    def act(self, game_manager):
+        super().act(game_manager)
+        if len(game_manager.towers) < game_manager.max_towers:
+            return
+        cheapest = min(game_manager.towers, key=lambda tower: tower.cost)
+        cash = game_manager.cash + cheapest.get_sell_value()
+        if any(cheapest.cost < tower_class.stats.cost <= cash for tower_class in TOWER_TYPES.values()):
+            game_manager.sell_tower(cheapest.position)
+            super().act(game_manager)
+
+STRATEGIES = {strategy.name: strategy for strategy in (Strategy, GreedyStrategy, RandomStrategy, UpgradeStrategy)}
+
+def wave_type(game_manager):
+    # The enemy kinds a wave is made of, e.g. "rackettra+space_rex" or "demolishyah"
+    return "+".join(sorted({kind for lane in game_manager.lanes for kind, _ in lane.spawn_queue})) or "empty"
+
+class WaveMetrics:
+    def __init__(self, game_manager):
+        self.wave = game_manager.current_wave
+        self.type = wave_type(game_manager)
+        self.frame_ms = []
+        self.peak_enemies = self.peak_projectiles = 0
+        self.started = time.perf_counter()
+
+    def record(self, game_manager, ms):
+        self.frame_ms.append(ms)
+        self.peak_enemies = max(self.peak_enemies, len(game_manager.enemies))
+        self.peak_projectiles = max(self.peak_projectiles, len(game_manager.projectiles))
+
+    def finish(self, game_manager, outcome):
+        frame_ms = sorted(self.frame_ms) or [0]
+        return {
+            "wave": self.wave,
+            "type": self.type,
+            "outcome": outcome,
+            "frames": len(self.frame_ms),
+            "seconds": round(time.perf_counter() - self.started, 3),
+            "mean_ms": round(sum(frame_ms) / len(frame_ms), 4),
+            "p99_ms": round(frame_ms[min(int(len(frame_ms) * 0.99), len(frame_ms) - 1)], 4),
+            "max_ms": round(frame_ms[-1], 4),
+            "peak_enemies": self.peak_enemies,
+            "peak_projectiles": self.peak_projectiles,
+            "towers": len(game_manager.towers),
+            "cash": int(game_manager.cash),
+            "base_hp": game_manager.base_hp,
+            "rss_kb": resident_kb(),
+            "gc_objects": len(gc.get_objects()),
+        }
+
+def play(game_manager, step, strategy_name, seed, max_waves, cash=None):
+    # Plays one game with step() advancing a frame; returns the per-wave metrics
+    rng = random.Random(seed)
+    strategy = STRATEGIES[strategy_name](game_manager, rng)
+    game_manager.auto_skip = True
+    game_manager.game_state = "wave_prep"
+    if cash is not None:
+        game_manager.cash = cash
+    strategy.act(game_manager)
+    game_manager.start_wave()
+    metrics = WaveMetrics(game_manager)
+    waves = []
+    ticks = 0
+    while game_manager.game_state == "playing":
+        wave = game_manager.current_wave
+        started = time.perf_counter()
+        if not step():
+            break  # Window closed
+        metrics.record(game_manager, (time.perf_counter() - started) * 1000)
+        ticks += 1
+        if game_manager.current_wave != wave or game_manager.game_state != "playing":
+            # Auto skip started the next wave at the end of this one
+            outcome = "cleared" if game_manager.current_wave != wave else game_manager.game_state
+            waves.append(metrics.finish(game_manager, outcome))
+            if len(waves) >= max_waves:
+                break
+            metrics = WaveMetrics(game_manager)
+            strategy.act(game_manager)
+        elif ticks % DECISION_TICKS == 0:
+            strategy.act(game_manager)
+    return waves
+
+def play_headless(simulation, run):
+    # fork_map worker: one game from a fresh simulation
+    seed, strategy_name, max_waves, cash = run
+    gm = simulation.game_manager
+    gm.rng.seed(seed)
+
+    def step():
+        simulation.step()
+        return True
+    return {"seed": seed, "strategy": strategy_name,
+            "waves": play(gm, step, strategy_name, seed, max_waves, cash)}
+
+def play_rendered(args, seed):
+    from main import Game  # Opens the display
+    game = Game(idle_sleep=False, map_name=args.map, maze=args.maze)
+    game.audio.start()
+    gm = game.game_manager
+    gm.rng.seed(seed)
+
+    def step():
+        game.handle_events()
+        if not game.running:
+            return False
+        game.update()
+        game.draw()
+        return True
+    return {"seed": seed, "strategy": args.strategy,
+            "waves": play(gm, step, args.strategy, seed, args.waves, args.cash)}
+
+def summarize(runs):
+    # Per wave type across every run: frame times and the highest memory seen
+    by_type = {}
+    for run in runs:
+        for wave in run["waves"]:
+            by_type.setdefault(wave["type"], []).append(wave)
+    for kind, waves in sorted(by_type.items(), key=lambda item: min(wave["wave"] for wave in item[1])):
+        frames = sum(wave["frames"] for wave in waves)
+        mean = sum(wave["mean_ms"] * wave["frames"] for wave in waves) / max(frames, 1)
+        rss = [wave["rss_kb"] for wave in waves if wave["rss_kb"] is not None]
+        print(f"{kind:<40} {len(waves):>5} waves  mean {mean:7.3f} ms  "
+              f"p99 {max(wave['p99_ms'] for wave in waves):7.3f} ms  max {max(wave['max_ms'] for wave in waves):7.3f} ms  "
+              f"peak RSS {max(rss) if rss else '-'} KB")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play whole games unattended and measure every wave")
+    parser.add_argument("--strategy", default="greedy", choices=sorted(STRATEGIES),
+                        help="how the bot buys and sells towers (default: greedy)")
+    parser.add_argument("--runs", type=int, default=1, help="games to play, one seed each (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (default: 0)")
+    parser.add_argument("--waves", type=int, default=MAX_WAVES, help=f"stop after this many waves (default: {MAX_WAVES})")
+    parser.add_argument("--cash", type=int, default=None,
+                        help="starting cash, e.g. 5000 to reach the late waves (default: the game's own)")
+    parser.add_argument("--map", default=DEFAULT_MAP, choices=sorted(MAPS), help=f"map to play (default: {DEFAULT_MAP})")
+    parser.add_argument("--maze", action="store_true", help="play in maze mode")
+    parser.add_argument("--render", action="store_true", help="play through the game window, drawing every frame")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="headless games played at once (default: one per CPU)")
+    parser.add_argument("--json", metavar="PATH", help="write every run's per-wave metrics to PATH")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    seeds = range(args.seed, args.seed + args.runs)
+    start = time.perf_counter()
+    if args.render:
+        runs = [play_rendered(args, seed) for seed in seeds]
+        pygame.quit()
+    else:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Sprites load without a display
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        simulation = HeadlessSimulation(map_name=args.map, maze=args.maze)
+        runs = fork_map(simulation, play_headless, [(seed, args.strategy, args.waves, args.cash) for seed in seeds],
+                        args.workers)
+    failed = sum(run is None for run in runs)
+    runs = [run for run in runs if run]
+
+    for run in runs:
+        last = run["waves"][-1] if run["waves"] else None
+        print(f"Seed {run['seed']}: {len(run['waves'])} waves, "
+              f"{'ended ' + last['outcome'] if last else 'no waves played'}")
+    print(f"\nPlayed {len(runs)} games in {time.perf_counter() - start:.1f}s"
+          + (f" ({failed} failed)" if failed else ""))
+    summarize(runs)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"strategy": args.strategy, "map": args.map, "maze": args.maze, "runs": runs}, f, indent=1)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
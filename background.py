@@ -0,0 +1,108 @@
+import math
+import random
+from collections import OrderedDict
+import pygame
+
+# The city backdrop (roads, building blocks, path highlights), generated in
+# square tiles the first time each one comes into view and cached per scale.
+# Tiles are seeded by their coordinates, so a tile that was evicted comes back
+# exactly the same, and maps of any size only pay for what is on screen.
+TILE_SIZE = 240  # Multiple of the 120 px building grid, so blocks never straddle tiles
+BUILDING_GRID = 120
+MAX_CACHED_TILES = 160  # A full window of tiles at the smallest zoom, with room to scroll
+
+BACKGROUND_COLOR = (40, 40, 40)
+ROAD_COLOR = (70, 70, 70)
+BUILDING_COLORS = [
+    (60, 60, 65),  # Dark gray
+    (80, 80, 85),  # Medium gray
+    (100, 100, 105),  # Light gray
+]
+BUILDING_SIZES = [(60, 60), (80, 80), (100, 100)]
+WINDOW_COLOR = (120, 120, 125)
+WINDOW_SIZE = 8
+
+def point_to_line_distance(point, line_start, line_end):
+    # Calculate distance from point to line segment
+    line_vec = line_end - line_start
+    point_vec = point - line_start
+    line_length = line_vec.length()
+    if line_length == 0:
+        return point_vec.length()
+
+    t = max(0, min(1, point_vec.dot(line_vec) / (line_length * line_length)))
+    projection = line_start + line_vec * t
+    return (point - projection).length()
+
+class TiledBackground:
+    def __init__(self, world_size, paths, seed=None):
+        # paths: one list of waypoints per lane
+        self.world_size = world_size
+        self.paths = paths
+        self.segments = [(pygame.math.Vector2(start), pygame.math.Vector2(end))
+                         for path in paths for start, end in zip(path, path[1:])]
+        # A new city layout every launch, like the old single-surface background
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.tiles = OrderedDict()  # (scale, tile x, tile y) -> surface, least recently used first
+
+    def render_tile(self, tile_x, tile_y):
+        left, top = tile_x * TILE_SIZE, tile_y * TILE_SIZE
+        tile = pygame.Surface((TILE_SIZE, TILE_SIZE))
+        tile.fill(BACKGROUND_COLOR)
+
+        # Roads following the path (lines are clipped to the tile)
+        for start, end in self.segments:
+            pygame.draw.line(tile, ROAD_COLOR, start - (left, top), end - (left, top), 40)
+
+        # Building blocks avoiding the path
+        rng = random.Random(f"{self.seed}:{tile_x}:{tile_y}")
+        width, height = self.world_size
+        for x in range(left, min(left + TILE_SIZE, width), BUILDING_GRID):
+            for y in range(top, min(top + TILE_SIZE, height), BUILDING_GRID):
+                pos = pygame.math.Vector2(x + 30, y + 30)
+                if any(point_to_line_distance(pos, start, end) < 60 for start, end in self.segments):
+                    continue
+                color = rng.choice(BUILDING_COLORS)
+                size = rng.choice(BUILDING_SIZES)
+                pygame.draw.rect(tile, color, (x - left, y - top, size[0], size[1]))
+                for wx in range(x + 10, x + size[0] - 10, 20):
+                    for wy in range(y + 10, y + size[1] - 10, 20):
+                        pygame.draw.rect(tile, WINDOW_COLOR, (wx - left, wy - top, WINDOW_SIZE, WINDOW_SIZE))
+
+        # Path highlights: border, then center
+        for start, end in self.segments:
+            pygame.draw.line(tile, (100, 100, 100), start - (left, top), end - (left, top), 42)
+            pygame.draw.line(tile, (80, 80, 80), start - (left, top), end - (left, top), 40)
+        return tile
+
+    def get_tile(self, scale, tile_x, tile_y):
+        key = (scale, tile_x, tile_y)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+        tile = self.tiles.get((1.0, tile_x, tile_y))  # Scaled tiles start from the full-size one
+        if tile is None:
+            tile = self.render_tile(tile_x, tile_y)
+        if scale != 1.0:
+            # Rounded up so neighbouring tiles overlap by a pixel instead of leaving a gap
+            size = math.ceil(TILE_SIZE * scale)
+            tile = pygame.transform.smoothscale(tile, (size, size))
+        self.tiles[key] = tile
+        while len(self.tiles) > MAX_CACHED_TILES:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def draw(self, surface, view):
+        visible = view.visible_rect()
+        width, height = self.world_size
+        first_x = max(visible.left, 0) // TILE_SIZE
+        first_y = max(visible.top, 0) // TILE_SIZE
+        last_x = (min(visible.right, width) - 1) // TILE_SIZE
+        last_y = (min(visible.bottom, height) - 1) // TILE_SIZE
+        blits = []
+        for tile_y in range(first_y, last_y + 1):
+            for tile_x in range(first_x, last_x + 1):
+                blits.append((self.get_tile(view.scale, tile_x, tile_y),
+                              view.point((tile_x * TILE_SIZE, tile_y * TILE_SIZE))))
+        surface.blits(blits, doreturn=False)
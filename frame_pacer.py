@@ -0,0 +1,133 @@
+import math
+import time
+from array import array
+
+# Frame pacing on time.perf_counter() instead of Clock.tick(FPS), whose sleep is
+# only as fine as the OS timer (up to ~15 ms on Windows), plus a fixed-step
+# game clock. Gameplay counts frames in some places (enemy movement and
+# abilities) and milliseconds in others (tower cooldowns, beams, heal pulses),
+# so every game tick is exactly 1/60 s of game time: a slow frame is followed by
+# extra ticks to catch up instead of slowing the game down.
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5  # Past this far behind the game slows down rather than spiralling
+SNAP_MS = 1.0  # A frame this close to one tick counts as exactly one (no 0/2 tick alternation)
+SPIN_MS = 2.0  # Busy-wait before each deadline; raised if sleeps overshoot by more
+SPIN_DECAY = 0.9  # Share of a raised margin (above SPIN_MS) kept after each on-time frame
+HISTORY = 600  # Frame times kept for the percentiles (10 s at 60 FPS)
+
+class GameClock:
+    # Game time in ms; the game manager's get_ticks reads it
+    def __init__(self):
+        self.time = 0.0
+
+    def get_ticks(self):
+        return int(self.time)  # Whole ms like pygame.time.get_ticks() (saves store ints)
+
+    def advance(self, ms=TICK_MS):
+        self.time += ms
+
+class FramePacer:
+    def __init__(self, fps, tick_ms=TICK_MS):
+        self.period = 1 / fps
+        self.tick_s = tick_ms / 1000
+        self.base_spin = self.spin = SPIN_MS / 1000
+        self.frame_ms = 0  # Length of the last frame, for anything animated in real time
+        self.frame_times = array("d", bytes(8 * HISTORY))  # Ring buffer of frame lengths in ms
+        self.reset()
+        self.reset_stats()
+
+    def reset(self):
+        # Start pacing from now, e.g. after the loop has been blocked waiting for input
+        now = time.perf_counter()
+        self.last_frame = now
+        self.next_frame = now + self.period
+        self.last_tick = now
+        self.accumulator = 0.0
+
+    def reset_stats(self):
+        self.frames = 0
+        self.total_ms = 0.0
+        self.total_squares = 0.0
+        self.worst_ms = 0.0
+        self.late_frames = 0  # Frames that took more than 1.5 periods
+        self.ticks = 0
+        self.ticks_dropped = 0  # Game time given up because a frame was too far behind
+        self.wall_s = 0.0  # Real time the ticks were handed out over
+
+    def ticks_due(self):
+        # How many fixed game ticks to run this frame to keep up with real time
+        now = time.perf_counter()
+        elapsed = now - self.last_tick
+        self.last_tick = now
+        self.wall_s += elapsed
+        if abs(elapsed - self.tick_s) * 1000 < SNAP_MS:
+            elapsed = self.tick_s
+        self.accumulator += elapsed
+        ticks = int(self.accumulator / self.tick_s)
+        if ticks > MAX_TICKS_PER_FRAME:
+            self.ticks_dropped += ticks - MAX_TICKS_PER_FRAME
+            ticks = MAX_TICKS_PER_FRAME
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.tick_s
+        self.ticks += ticks
+        return ticks
+
+    def wait(self):
+        # Sleep until shortly before the next frame is due, then spin up to it
+        remaining = self.next_frame - time.perf_counter()
+        overshoot = 0
+        if remaining > self.spin:
+            requested = remaining - self.spin
+            slept_from = time.perf_counter()
+            time.sleep(requested)
+            overshoot = time.perf_counter() - slept_from - requested
+        if overshoot > self.spin:
+            self.spin = min(overshoot * 1.25, self.period / 2)
+        else:
+            # On time: ease back down so one hiccup doesn't leave every later frame spinning
+            self.spin = self.base_spin + (self.spin - self.base_spin) * SPIN_DECAY
+        while time.perf_counter() < self.next_frame:
+            pass
+        now = time.perf_counter()
+        self.next_frame += self.period
+        if now > self.next_frame:
+            self.next_frame = now + self.period  # More than a frame late: don't rush the next ones
+        self.record((now - self.last_frame) * 1000)
+        self.last_frame = now
+
+    def record(self, ms):
+        self.frame_ms = ms
+        self.frame_times[self.frames % HISTORY] = ms
+        self.frames += 1
+        self.total_ms += ms
+        self.total_squares += ms * ms
+        self.worst_ms = max(self.worst_ms, ms)
+        if ms > self.period * 1500:
+            self.late_frames += 1
+
+    def stats(self):
+        # Frame-time mean, jitter (standard deviation) and tail since the last
+        # reset_stats(), and game time run per second of real time
+        if not self.frames:
+            return None
+        mean = self.total_ms / self.frames
+        recent = sorted(self.frame_times[:min(self.frames, HISTORY)])
+        return {
+            "frames": self.frames,
+            "mean_ms": mean,
+            "jitter_ms": math.sqrt(max(self.total_squares / self.frames - mean * mean, 0)),
+            "p99_ms": recent[min(int(len(recent) * 0.99), len(recent) - 1)],
+            "worst_ms": self.worst_ms,
+            "late_frames": self.late_frames,
+            "ticks_dropped": self.ticks_dropped,
+            "game_speed": self.ticks * self.tick_s / self.wall_s if self.wall_s else 1.0,
+        }
+
+    def report(self):
+        stats = self.stats()
+        if stats:
+            print(f"Frames: {stats['frames']}  mean {stats['mean_ms']:.2f} ms  jitter {stats['jitter_ms']:.2f} ms  "
+                  f"p99 {stats['p99_ms']:.2f} ms  worst {stats['worst_ms']:.2f} ms  late {stats['late_frames']}  "
+                  f"game speed {stats['game_speed']:.3f}x ({stats['ticks_dropped']} ticks dropped)")
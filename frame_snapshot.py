@@ -0,0 +1,55 @@
+import pygame
+from pygame.math import Vector2
+
+# Everything Game.draw() reads from the game manager, frozen at the end of a
+# simulation tick. With the threaded pipeline the main thread renders one
+# snapshot while the next tick runs on the simulation thread and fills the
+# other one. Entities are copied with their own position and rect (the
+# simulation moves the originals in place); sprites and stat blocks are shared.
+_slot_names = {}
+
+def slot_names(cls):
+    # Every __slots__ entry of the class and its bases, cached per class
+    names = _slot_names.get(cls)
+    if names is None:
+        names = []
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get("__slots__", ())
+            names.extend([slots] if isinstance(slots, str) else slots)
+        names = _slot_names[cls] = tuple(names)
+    return names
+
+def freeze(entity):
+    copy = object.__new__(type(entity))
+    for name in slot_names(type(entity)):
+        value = getattr(entity, name, None)
+        if type(value) is Vector2:
+            value = Vector2(value)
+        elif type(value) is pygame.Rect:
+            value = pygame.Rect(value)
+        setattr(copy, name, value)
+    return copy
+
+class FrameSnapshot:
+    # Attribute names match GameManager, so the HUD code can take either
+    __slots__ = ("game_state", "cash", "current_wave", "max_waves", "base_hp", "max_towers",
+                 "boss_wave_notification", "world_size", "towers", "enemies", "projectiles",
+                 "effects", "particles", "preview", "time")
+
+    def __init__(self, game_manager, particles, preview=None):
+        gm = game_manager
+        self.game_state = gm.game_state
+        self.cash = gm.cash
+        self.current_wave = gm.current_wave
+        self.max_waves = gm.max_waves
+        self.base_hp = gm.base_hp
+        self.max_towers = gm.max_towers
+        self.boss_wave_notification = getattr(gm, "boss_wave_notification", False)
+        self.world_size = gm.world_size
+        self.towers = [freeze(tower) for tower in gm.towers]
+        self.enemies = [freeze(enemy) for enemy in gm.enemies]
+        self.projectiles = [freeze(projectile) for projectile in gm.projectiles]
+        self.effects = [freeze(effect) for effect in gm.effects]
+        self.particles = particles.copy()
+        self.preview = preview  # (position, placeable) for the selected tower, or None
+        self.time = gm.get_ticks()  # Game time the effects are drawn at
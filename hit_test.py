@@ -0,0 +1,77 @@
+import pygame
+
+# Point lookups for mouse input. Both indexes bucket their contents by grid
+# cell when things are placed (or the UI is laid out), so finding what is under
+# the cursor only looks at one cell's worth of candidates, however many towers
+# or widgets there are.
+WIDGET_CELL_SIZE = 32
+TOWER_CELL_SIZE = 40  # Tower size: a tower's rect and its placement clearance reach at most one cell over
+
+class WidgetIndex:
+    def __init__(self, widgets=()):
+        # widgets: (name, screen rect) pairs, topmost first
+        self.cells = {}  # (cell x, cell y) -> [(name, rect)] in widget order
+        for name, rect in widgets:
+            self.add(name, rect)
+
+    def add(self, name, rect):
+        # Widgets added later sit under the earlier ones
+        rect = pygame.Rect(rect)
+        for cell_x in range(rect.left // WIDGET_CELL_SIZE, (rect.right - 1) // WIDGET_CELL_SIZE + 1):
+            for cell_y in range(rect.top // WIDGET_CELL_SIZE, (rect.bottom - 1) // WIDGET_CELL_SIZE + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append((name, rect))
+
+    def at(self, position, hidden=()):
+        # Name of the topmost widget under position, skipping the hidden ones
+        cell = (int(position[0]) // WIDGET_CELL_SIZE, int(position[1]) // WIDGET_CELL_SIZE)
+        for name, rect in self.cells.get(cell, ()):
+            if name not in hidden and rect.collidepoint(position):
+                return name
+        return None
+
+def tower_cell(position):
+    return (int(position[0]) // TOWER_CELL_SIZE, int(position[1]) // TOWER_CELL_SIZE)
+
+class TowerGrid:
+    # Placed towers by the cell their centre is in
+    def __init__(self):
+        self.cells = {}
+        self.sequence = 0  # Placement order, so overlapping corners resolve to the older tower
+        self.placed = {}  # Tower -> sequence
+
+    def rebuild(self, towers):
+        self.cells = {}
+        self.placed = {}
+        for tower in towers:
+            self.add(tower)
+
+    def add(self, tower):
+        self.cells.setdefault(tower_cell(tower.position), []).append(tower)
+        self.placed[tower] = self.sequence
+        self.sequence += 1
+
+    def remove(self, tower):
+        del self.placed[tower]
+        cell = tower_cell(tower.position)
+        towers = self.cells[cell]
+        towers.remove(tower)
+        if not towers:
+            del self.cells[cell]
+
+    def nearby(self, position):
+        # Towers in the 3x3 cells around position
+        cell_x, cell_y = tower_cell(position)
+        for x in (cell_x - 1, cell_x, cell_x + 1):
+            for y in (cell_y - 1, cell_y, cell_y + 1):
+                yield from self.cells.get((x, y), ())
+
+    def at(self, position):
+        # The tower whose rect contains position, if any (the oldest where
+        # diagonal neighbours' corners overlap)
+        hits = [tower for tower in self.nearby(position) if tower.rect.collidepoint(position)]
+        return min(hits, key=self.placed.get, default=None)
+
+    def any_within(self, position, distance):
+        # distance must not exceed TOWER_CELL_SIZE
+        position = pygame.math.Vector2(position)
+        return any((tower.position - position).length() < distance for tower in self.nearby(position))
@@ -0,0 +1,36 @@
+import pygame
+from background import point_to_line_distance
+
+# A map has one or more lanes, each an enemy path from its own spawn point to
+# an exit. Every lane keeps its own spawn queue and the enemies walking it, and
+# each tower remembers which lanes pass within its range when it is placed, so
+# targeting only looks at enemies that could possibly be in range.
+PATH_WIDTH = 40
+
+class Lane:
+    def __init__(self, index, path):
+        self.index = index
+        self.path = list(path)
+        self.segments = [(pygame.math.Vector2(start), pygame.math.Vector2(end))
+                         for start, end in zip(self.path, self.path[1:])]
+        # Road area of every segment, for tower placement checks
+        self.rects = []
+        for start, end in self.segments:
+            if start.x == end.x:  # Vertical path
+                rect = pygame.Rect(start.x - PATH_WIDTH / 2, min(start.y, end.y),
+                                   PATH_WIDTH, abs(end.y - start.y))
+            else:  # Horizontal path
+                rect = pygame.Rect(min(start.x, end.x), start.y - PATH_WIDTH / 2,
+                                   abs(end.x - start.x), PATH_WIDTH)
+            self.rects.append(rect)
+        self.spawn_queue = []  # (enemy type, stage) still to come this wave
+        self.last_spawn_time = 0
+        self.enemies = []  # Live enemies on this lane, in spawn order
+
+    def distance_to(self, position):
+        position = pygame.math.Vector2(position)
+        return min(point_to_line_distance(position, start, end) for start, end in self.segments)
+
+    def within_reach(self, position, reach):
+        # Enemies stay on the path, so none of them can get closer than the path itself
+        return self.distance_to(position) <= reach + 1  # +1 px against rounding
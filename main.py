@@ -1,20 +1,39 @@
+from startup_profile import STARTUP  # First, so the startup clock includes every import
 import pygame
+STARTUP.mark("pygame import")  # Pulls in NumPy and pkg_resources by itself
 import sys
 import os
+import time
+import argparse
 from pygame.locals import *
 from game_manager import GameManager
 from ui_manager import UIManager
-from projectile import Bullet, Maser, Missile, Beam, HealEffect
-from enemy import Rackettra, SpaceRex, Enviorollante, EmperorHydra, Demolishyah
-import random
+from enemy import Enemy
+from particles import ParticleSystem
+from audio import AudioManager
+from frame_snapshot import FrameSnapshot
+from frame_pacer import FramePacer, GameClock, TICK_MS
+from render_cache import get_font, get_overlay, get_text
+from viewport import Viewport, DynamicResolution, Camera, PAN_SPEED
+from background import TiledBackground
+from maps import MAPS, DEFAULT_MAP
 
-# Initialize Pygame
-pygame.init()
+STARTUP.mark("game modules")
+
+# Initialize Pygame: only what the menu needs. pygame.init() would also open
+# the audio device, joysticks etc. before the window appears; the mixer is
+# started by AudioManager once the menu is up.
+pygame.display.init()
+pygame.font.init()
+STARTUP.mark("pygame init")
 
 # Constants
 WINDOW_WIDTH = 1024
 WINDOW_HEIGHT = 768
 FPS = 60
+IDLE_TIMEOUT_MS = 500  # Longest the loop blocks waiting for input while nothing is moving
+FRAME_STATS_FRAMES = 600  # Frames per --frame-stats report (10 s at 60 FPS)
+CULL_MARGIN = 20  # World pixels kept around the view so health bars and edges don't pop
 
 # Colors
 BLACK = (0, 0, 0)
@@ -33,138 +52,157 @@ def load_sprite(filename, size=(40, 40)):
         return surface
 
 class Game:
-    def __init__(self):
+    def __init__(self, autosave_path=None, autosave_interval=15, idle_sleep=True, telemetry_path=None,
+                 render_scale=1.0, dynamic_resolution=False, map_name=DEFAULT_MAP, maze=False,
+                 threaded=False, startup_profile=None, spectator=None, frame_stats=False):
         print("Initializing game...")  # Debug output
+        # Reports time to first frame by stage when set (--startup-profile)
+        self.startup_profile = startup_profile
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Kaiju Tower Defense")
-        pygame.mixer.init()  # Initialize audio
-        self.clock = pygame.time.Clock()
+        self.mark_startup("window")
+        self.audio = AudioManager()  # Opened after the first frame, see run()
+        # Frames are paced to FPS on perf_counter; the game itself runs on
+        # fixed 60 Hz ticks of its own clock, however long each frame takes
+        self.pacer = FramePacer(FPS)
+        self.game_clock = GameClock()
+        self.frame_stats = frame_stats  # Print frame-time jitter and game speed every FRAME_STATS_FRAMES
         self.running = True
+        self.idle_sleep = idle_sleep  # Drop to event-driven redraws when nothing is moving
+        # Threaded pipeline: tick N+1 is simulated on a second thread while frame N
+        # is drawn from a snapshot (pygame releases the GIL in blits and flips)
+        self.simulation_thread = None
+        if threaded:
+            from concurrent.futures import ThreadPoolExecutor
+            self.simulation_thread = ThreadPoolExecutor(max_workers=1)
+        self.frame = None  # Snapshot waiting to be drawn
+        self.spectator = spectator  # Optional SpectatorServer streaming the game to other screens
         
-        # Load and set up background music
-        try:
-            pygame.mixer.music.load("assets/background_music.mp3")
-            pygame.mixer.music.set_volume(0.4)  # Set to 40% volume
-            print("Background music loaded successfully")
-        except Exception as e:
-            print(f"Error loading background music: {e}")
-        
-        self.game_manager = GameManager()
+        # Fonts and logo: all the menu needs
         self.ui_manager = UIManager(WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.mark_startup("menu fonts and logo")
         
-        # Create city background
-        self.background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        self.create_city_background()
-        
-        print("Game initialized successfully")  # Debug output
-    
-    def create_city_background(self):
-        # Base background color (dark gray)
-        self.background.fill((40, 40, 40))
+        self.game_manager = GameManager(map_name=map_name, maze=maze)
+        self.game_manager.get_ticks = self.game_clock.get_ticks
+        self.telemetry = None
+        if telemetry_path:
+            from telemetry import CombatTelemetry
+            self.telemetry = CombatTelemetry(telemetry_path)
+        self.game_manager.telemetry = self.telemetry
+        self.particles = ParticleSystem()
+        self.game_manager.particles = self.particles
+        self.game_manager.audio = self.audio
         
-        # Draw roads (lighter gray)
-        road_color = (70, 70, 70)
-        # Main roads following the path
-        for i in range(len(self.game_manager.path) - 1):
-            start = self.game_manager.path[i]
-            end = self.game_manager.path[i + 1]
-            pygame.draw.line(self.background, road_color, start, end, 40)
+        # The world layer is seen through a camera, and may be drawn at a lower
+        # internal resolution and upscaled
+        self.view = Viewport(window_size=(WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.load_map()
+        self.dynamic_resolution = None
+        if dynamic_resolution:
+            self.dynamic_resolution = DynamicResolution(1000 / FPS, max_scale=render_scale)
+        self.set_render_scale(render_scale)
+        self.mark_startup("game state")
         
-        # Building placeholders (various gray tones)
-        building_colors = [
-            (60, 60, 65),  # Dark gray
-            (80, 80, 85),  # Medium gray
-            (100, 100, 105),  # Light gray
-        ]
+        # Autosave lets a crashed kiosk session resume at the current wave
+        self.autosaver = None
+        if autosave_path:
+            from save_state import AutoSaver
+            self.autosaver = AutoSaver(autosave_path, autosave_interval * 1000)
+            if os.path.exists(autosave_path):
+                self.resume(autosave_path)
+            self.mark_startup("autosave")
         
-        # Add building blocks avoiding the path
-        building_sizes = [(60, 60), (80, 80), (100, 100)]
-        for x in range(0, WINDOW_WIDTH, 120):
-            for y in range(0, WINDOW_HEIGHT, 120):
-                # Check if position is far enough from path
-                can_place = True
-                for i in range(len(self.game_manager.path) - 1):
-                    start = pygame.math.Vector2(self.game_manager.path[i])
-                    end = pygame.math.Vector2(self.game_manager.path[i + 1])
-                    pos = pygame.math.Vector2(x + 30, y + 30)
-                    if self.point_to_line_distance(pos, start, end) < 60:
-                        can_place = False
-                        break
-                
-                if can_place:
-                    color = building_colors[random.randint(0, len(building_colors)-1)]
-                    size = building_sizes[random.randint(0, len(building_sizes)-1)]
-                    pygame.draw.rect(self.background, color, 
-                                   (x, y, size[0], size[1]))
-                    # Add windows (lighter gray)
-                    window_color = (120, 120, 125)
-                    window_size = 8
-                    for wx in range(x + 10, x + size[0] - 10, 20):
-                        for wy in range(y + 10, y + size[1] - 10, 20):
-                            pygame.draw.rect(self.background, window_color,
-                                          (wx, wy, window_size, window_size))
-
-    def point_to_line_distance(self, point, line_start, line_end):
-        # Calculate distance from point to line segment
-        line_vec = line_end - line_start
-        point_vec = point - line_start
-        line_length = line_vec.length()
-        if line_length == 0:
-            return point_vec.length()
+        print("Game initialized successfully")  # Debug output
+    
+    def mark_startup(self, stage):
+        if self.startup_profile:
+            self.startup_profile.mark(stage)
+    
+    def resume(self, path):
+        from save_state import load_game
+        try:
+            load_game(self.game_manager, path)
+            self.load_map()  # The save decides the map
+            auto_skip = self.game_manager.auto_skip
+            self.ui_manager.buttons["auto_skip"].text = f"Auto Skip: {'On' if auto_skip else 'Off'}"
+            print(f"Resumed saved game at wave {self.game_manager.current_wave}")
+        except Exception as e:
+            print(f"Error loading saved game: {e}")
+            self.game_manager = GameManager(map_name=self.game_manager.map_name, maze=self.game_manager.maze)
+            self.game_manager.get_ticks = self.game_clock.get_ticks
+            self.game_manager.telemetry = self.telemetry
+            self.game_manager.particles = self.particles
+            self.game_manager.audio = self.audio
+            self.load_map()
+            return
         
-        t = max(0, min(1, point_vec.dot(line_vec) / (line_length * line_length)))
-        projection = line_start + line_vec * t
-        return (point - projection).length()
+        self.audio.play_music()  # Skip the intro roar when resuming
+    
+    def load_map(self):
+        # Background and camera for the game manager's current map
+        gm = self.game_manager
+        self.background = TiledBackground(gm.world_size, [lane.path for lane in gm.lanes])
+        self.camera = Camera((WINDOW_WIDTH, WINDOW_HEIGHT), gm.world_size)
+        self.view.set_camera(self.camera.origin, self.camera.zoom)
+    
+    def set_render_scale(self, scale):
+        self.view.set_scale(scale)
+        if scale == 1.0:
+            self.world = self.screen  # Draw straight to the display
+        else:
+            self.world = pygame.Surface((int(WINDOW_WIDTH * scale), int(WINDOW_HEIGHT * scale))).convert()
+    
+    def pan_direction(self):
+        # Arrow keys or WASD, as (dx, dy) in -1..1
+        keys = pygame.key.get_pressed()
+        dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
+        dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+        return dx, dy
+    
+    def update_camera(self):
+        dx, dy = self.pan_direction()
+        if dx or dy:
+            distance = PAN_SPEED * min(self.pacer.frame_ms, 100) / 1000
+            self.camera.pan(dx * distance, dy * distance)
+        self.view.set_camera(self.camera.origin, self.camera.zoom)
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
                 return
             
-            # Handle mouse events
+            # Handle mouse events: UI widgets first, the map only gets clicks outside them
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+                widget = self.ui_manager.widget_at(event.pos, self.game_manager)
                 
-                # Menu state handling
-                if self.game_manager.game_state == "menu":
-                    # Check for start game click
-                    if self.ui_manager.buttons["start"].rect.collidepoint(mouse_pos):
-                        self.game_manager.game_state = "wave_prep"
-                        # Play start sound and then background music
-                        if self.ui_manager.start_sound:
-                            self.ui_manager.start_sound.play()
-                            # Start background music after the roar
-                            pygame.time.set_timer(pygame.USEREVENT + 1, int(self.ui_manager.start_sound.get_length() * 1000))
-                        else:
-                            # If no start sound, play music immediately
-                            pygame.mixer.music.play(-1)
-                        continue
+                # Check for start game click
+                if widget == "start" and event.button == 1:
+                    self.game_manager.game_state = "wave_prep"
+                    # Play start sound and then background music
+                    start_sound = self.audio.play("intro_roar")
+                    if start_sound:
+                        # Start background music after the roar
+                        pygame.time.set_timer(pygame.USEREVENT + 1, int(start_sound.get_length() * 1000))
+                    else:
+                        # If no start sound, play music immediately
+                        self.audio.play_music()
+                    continue
+                if widget is None and self.game_manager.game_state != "menu":
+                    self.handle_map_click(event)
+            
+            # Zoom the camera around the cursor
+            elif event.type == pygame.MOUSEWHEEL:
+                self.camera.zoom_at(pygame.mouse.get_pos(), event.y)
+                self.view.set_camera(self.camera.origin, self.camera.zoom)
             
             # Handle background music start after roar
             elif event.type == pygame.USEREVENT + 1:
-                pygame.mixer.music.play(-1)  # -1 means loop indefinitely
+                self.audio.play_music()
                 pygame.time.set_timer(pygame.USEREVENT + 1, 0)  # Disable the timer
             
-            # Handle tower placement and selling
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                if event.button == 1:  # Left click
-                    if self.ui_manager.selected_tower:
-                        if self.game_manager.can_place_tower(mouse_pos):
-                            tower_class = self.ui_manager.selected_tower["class"]
-                            tower = tower_class(mouse_pos[0], mouse_pos[1])
-                            if self.game_manager.cash >= tower.cost:
-                                self.game_manager.towers.append(tower)
-                                self.game_manager.cash -= tower.cost
-                                self.ui_manager.selected_tower = None
-                                self.ui_manager.show_tower_range = False
-                elif event.button == 3:  # Right click
-                    if self.ui_manager.selling_mode:
-                        self.game_manager.sell_tower(mouse_pos)
-                    self.ui_manager.selected_tower = None
-                    self.ui_manager.show_tower_range = False
-            
             try:
                 # Handle UI events
                 self.ui_manager.handle_events(event, self.game_manager)
@@ -173,203 +211,332 @@ class Game:
                 import traceback
                 traceback.print_exc()
     
-    def update(self):
+    def handle_map_click(self, event):
+        # Handle tower placement and selling
+        world_pos = self.view.to_world(event.pos)
+        if event.button == 1:  # Left click
+            if self.ui_manager.selected_tower:
+                if self.game_manager.buy_tower(self.ui_manager.selected_tower["class"], world_pos):
+                    self.ui_manager.selected_tower = None
+                    self.ui_manager.show_tower_range = False
+        elif event.button == 3:  # Right click
+            if self.ui_manager.selling_mode:
+                self.game_manager.sell_tower(world_pos)
+            self.ui_manager.selected_tower = None
+            self.ui_manager.show_tower_range = False
+    
+    def update(self, ticks=1):
+        self.update_camera()
+        for _ in range(ticks):
+            self.simulate()
+        self.show_wave_reward()
+    
+    def simulate(self):
+        # One game tick. Touches nothing but the game state, so it can run on the simulation thread.
+        self.game_clock.advance()
+        
         # Update game state
         previous_state = self.game_manager.game_state
+        reward_pending = hasattr(self.game_manager, 'wave_reward')
         self.game_manager.update()
         
+        # Always save at a wave boundary (once: the reward stays set until the
+        # frame's ticks are done and show_wave_reward() takes it)
+        if self.autosaver and not reward_pending and hasattr(self.game_manager, 'wave_reward'):
+            self.autosaver.save_now(self.game_manager, self.game_manager.get_ticks())
+        
+        # Update towers and projectiles
+        current_time = self.game_manager.get_ticks()
+        
+        if self.autosaver:
+            if self.game_manager.game_state in ["game_over", "victory"]:
+                if previous_state not in ["game_over", "victory"]:
+                    self.autosaver.clear()
+            else:
+                self.autosaver.update(self.game_manager, current_time)
+        
+        self.game_manager.update_combat(current_time)
+        self.particles.update(current_time)
+        if self.spectator:
+            self.spectator.publish(self.game_manager, current_time)
+    
+    def show_wave_reward(self):
         # Check for wave completion and show reward
         if hasattr(self.game_manager, 'wave_reward'):
             self.ui_manager.show_wave_reward(self.game_manager.wave_reward)
             delattr(self.game_manager, 'wave_reward')
+    
+    def placement_preview(self):
+        # Where the selected tower would go and whether it fits there
+        if not self.ui_manager.selected_tower:
+            return None
+        gm = self.game_manager
+        world_pos = gm.snap_to_grid(self.view.to_world(pygame.mouse.get_pos()))
+        return world_pos, gm.can_place_tower(world_pos)
+    
+    def capture(self):
+        return FrameSnapshot(self.game_manager, self.particles, self.placement_preview())
+    
+    def simulate_and_capture(self, ticks):
+        for _ in range(ticks):
+            self.simulate()
+        return self.capture()
+    
+    def pipelined_step(self, ticks):
+        # Draw frame N while the simulation thread computes the ticks for frame
+        # N+1. Input was handled before this, while the simulation thread was idle.
+        self.update_camera()
+        if self.frame is None:
+            self.frame = self.capture()  # First frame after starting or idling
+        pending = self.simulation_thread.submit(self.simulate_and_capture, ticks)
+        try:
+            self.draw(self.frame)
+        finally:
+            self.frame = pending.result()
+        self.show_wave_reward()
+    
+    def draw(self, frame=None):
+        # Draws the live game state, or a FrameSnapshot in the threaded pipeline
+        gm = frame or self.game_manager
+        current_time = frame.time if frame else gm.get_ticks()
         
-        # Update towers and projectiles
-        current_time = pygame.time.get_ticks()
-        
-        # Update towers
-        for tower in self.game_manager.towers:
-            if tower.can_shoot(current_time):
-                tower.acquire_target(self.game_manager.enemies)
-                if tower.target:
-                    shot_info = tower.shoot(current_time)
-                    
-                    if shot_info["type"] == "bullet":
-                        projectile = Bullet(
-                            tower.position, tower.target.position,
-                            shot_info["damage"]
-                        )
-                        self.game_manager.projectiles.append(projectile)
-                    
-                    elif shot_info["type"] == "maser":
-                        projectile = Maser(
-                            tower.position, tower.target.position,
-                            shot_info["damage"], shot_info["effect"]
-                        )
-                        if "speed" in shot_info:
-                            projectile.speed = shot_info["speed"]
-                        self.game_manager.projectiles.append(projectile)
-                    
-                    elif shot_info["type"] == "missile":
-                        projectile = Missile(
-                            tower.position, tower.target.position,
-                            shot_info["damage"], shot_info["aoe_radius"]
-                        )
-                        self.game_manager.projectiles.append(projectile)
-                    
-                    elif shot_info["type"] == "multi_missile":
-                        for target in shot_info["targets"]:
-                            projectile = Missile(
-                                tower.position, target.position,
-                                shot_info["damage"], shot_info["aoe_radius"]
-                            )
-                            self.game_manager.projectiles.append(projectile)
-                    
-                    elif shot_info["type"] == "beam":
-                        beam = Beam(
-                            shot_info["start"], shot_info["end"],
-                            shot_info["damage"], shot_info["width"]
-                        )
-                        self.game_manager.projectiles.append(beam)
-                    
-                    elif shot_info["type"] == "heal":
-                        heal = HealEffect(
-                            tower.position, shot_info["range"],
-                            shot_info["heal_amount"]
-                        )
-                        self.game_manager.effects.append(heal)
+        # Draw UI
+        if gm.game_state == "menu":
+            # The menu covers the whole window, so the world isn't drawn under it
+            self.ui_manager.draw_menu(self.screen)
+        else:
+            particles = frame.particles if frame else self.particles
+            preview = frame.preview if frame else self.placement_preview()
+            self.draw_world(gm, particles, preview, current_time)
+            # UI is drawn at native resolution on top
+            self.ui_manager.draw_hud(self.screen, gm)
+            self.ui_manager.draw_tower_panel(self.screen, gm)
+            self.ui_manager.draw_tooltip(self.screen)
         
-        # Update projectiles and check for hits
-        for projectile in self.game_manager.projectiles[:]:
-            if isinstance(projectile, Beam):
-                if not projectile.update():
-                    self.game_manager.projectiles.remove(projectile)
-                else:
-                    # Handle beam damage to all enemies in its path
-                    beam_rect = pygame.Rect(
-                        min(projectile.start.x, projectile.end.x),
-                        min(projectile.start.y, projectile.end.y),
-                        abs(projectile.end.x - projectile.start.x) or projectile.width,
-                        abs(projectile.end.y - projectile.start.y) or projectile.width
-                    )
-                    for enemy in self.game_manager.enemies:
-                        if enemy.rect.colliderect(beam_rect):
-                            enemy.take_damage(projectile.damage * 0.1)  # Apply damage per frame (10 times per second)
-                continue
+        # Draw game over or victory screen
+        if gm.game_state in ["game_over", "victory"]:
+            surface = get_overlay((WINDOW_WIDTH, WINDOW_HEIGHT), BLACK, 128)
+            self.screen.blit(surface, (0, 0))
             
-            if projectile.update():
-                # Handle projectile hit
-                for enemy in self.game_manager.enemies:
-                    if enemy.rect.colliderect(projectile.rect):
-                        enemy.take_damage(projectile.damage)
-                        if isinstance(projectile, Maser):
-                            enemy.effects.update(projectile.effect)
-                        elif isinstance(projectile, Missile):
-                            # Handle AOE damage
-                            for other_enemy in self.game_manager.enemies:
-                                if other_enemy != enemy:
-                                    distance = (other_enemy.position - enemy.position).length()
-                                    if distance <= projectile.aoe_radius:
-                                        other_enemy.take_damage(projectile.damage * 0.5)
-                        break
-                self.game_manager.projectiles.remove(projectile)
+            text = "Game Over!" if gm.game_state == "game_over" else "Victory!"
+            font = get_font('Arial', 72)
+            text_surface = get_text(font, text, WHITE)
+            text_rect = text_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
+            self.screen.blit(text_surface, text_rect)
         
-        # Update effects
-        for effect in self.game_manager.effects[:]:
-            if not effect.update():
-                self.game_manager.effects.remove(effect)
-            elif isinstance(effect, HealEffect):
-                # Apply healing to nearby towers
-                for tower in self.game_manager.towers:
-                    distance = (tower.position - effect.position).length()
-                    if distance <= effect.range:
-                        # Implement tower healing if we add tower HP later
-                        pass
+        pygame.display.flip()
     
-    def draw(self):
-        # Draw background
-        self.screen.blit(self.background, (0, 0))
+    def draw_world(self, gm, particles, preview, current_time):
+        # World layer: drawn to self.world, which is the screen itself at
+        # native scale or a smaller surface that gets upscaled below
+        view = self.view
+        world = self.world
         
-        # Draw path highlights
-        for i in range(len(self.game_manager.path) - 1):
-            start_pos = self.game_manager.path[i]
-            end_pos = self.game_manager.path[i + 1]
-            # Draw path border
-            pygame.draw.line(self.screen, (100, 100, 100), start_pos, end_pos, 42)
-            # Draw path center
-            pygame.draw.line(self.screen, (80, 80, 80), start_pos, end_pos, 40)
+        # Draw background (path highlights included), only the tiles in view
+        self.background.draw(world, view)
+        
+        # Anything outside the camera's view is skipped; the margin covers
+        # health bars drawn above enemies
+        visible = view.visible_rect(CULL_MARGIN)
+        cull = not visible.contains(pygame.Rect((0, 0), gm.world_size))
         
         # Draw towers
-        for tower in self.game_manager.towers:
-            tower.draw(self.screen, self.ui_manager.show_tower_range)
+        show_range = self.ui_manager.show_tower_range
+        for tower in gm.towers:
+            if cull:
+                bounds = tower.rect.inflate(tower.range * 2, tower.range * 2) if show_range else tower.rect
+                if not visible.colliderect(bounds):
+                    continue
+            tower.draw(world, show_range, view)
         
-        # Draw enemies
-        for enemy in self.game_manager.enemies:
-            enemy.draw(self.screen)
+        # Draw enemies (sprites and health bars in one batch)
+        enemy_blits = []
+        for enemy in gm.enemies:
+            if cull and not visible.colliderect(enemy.rect):
+                continue
+            enemy.add_draw_items(enemy_blits, view)
+        world.blits(enemy_blits, doreturn=False)
         
         # Draw projectiles
-        for projectile in self.game_manager.projectiles:
-            projectile.draw(self.screen)
+        for projectile in gm.projectiles:
+            if cull:
+                if projectile.kind == "beam":
+                    if not visible.clipline(projectile.start, projectile.end):
+                        continue
+                elif not visible.collidepoint(projectile.position):
+                    continue
+            projectile.draw(world, view)
+        
+        # Sparks and debris, all in one batch
+        particles.draw(world, view)
         
         # Draw effects
-        for effect in self.game_manager.effects:
-            effect.draw(self.screen)
+        for effect in gm.effects:
+            if cull and not visible.inflate(effect.range * 2, effect.range * 2).collidepoint(effect.position):
+                continue
+            effect.draw(world, view, current_time)
         
         # Draw tower placement preview
-        if self.ui_manager.selected_tower:
-            mouse_pos = pygame.mouse.get_pos()
-            preview_color = (0, 255, 0, 128) if self.game_manager.can_place_tower(mouse_pos) else (255, 0, 0, 128)
-            preview_surface = pygame.Surface((40, 40), pygame.SRCALPHA)
-            pygame.draw.rect(preview_surface, preview_color, (0, 0, 40, 40))
-            self.screen.blit(preview_surface, (mouse_pos[0] - 20, mouse_pos[1] - 20))
+        if preview and self.ui_manager.selected_tower:
+            world_pos, placeable = preview
+            preview_color = (0, 255, 0) if placeable else (255, 0, 0)
+            preview_surface = get_overlay(view.size((40, 40)), preview_color, 128)
+            world.blit(preview_surface, view.point((world_pos[0] - 20, world_pos[1] - 20)))
             
             if self.ui_manager.show_tower_range:
-                tower_class = self.ui_manager.selected_tower["class"]
-                tower = tower_class(mouse_pos[0], mouse_pos[1])
-                pygame.draw.circle(self.screen, (100, 100, 100, 64),
-                                 mouse_pos, tower.range, 1)
+                # Range is class-level metadata, no need to build a tower
+                tower_range = self.ui_manager.selected_tower["class"].stats.range
+                pygame.draw.circle(world, (100, 100, 100, 64),
+                                 view.point(world_pos), view.length(tower_range), 1)
         
-        # Draw UI
-        if self.game_manager.game_state == "menu":
-            self.ui_manager.draw_menu(self.screen)
-        else:
-            self.ui_manager.draw_hud(self.screen, self.game_manager)
-            self.ui_manager.draw_tower_panel(self.screen, self.game_manager)
-            self.ui_manager.draw_tooltip(self.screen)
-        
-        # Draw game over or victory screen
-        if self.game_manager.game_state in ["game_over", "victory"]:
-            surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-            surface.fill((0, 0, 0, 128))
-            self.screen.blit(surface, (0, 0))
-            
-            text = "Game Over!" if self.game_manager.game_state == "game_over" else "Victory!"
-            font = pygame.font.SysFont('Arial', 72)
-            text_surface = font.render(text, True, WHITE)
-            text_rect = text_surface.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
-            self.screen.blit(text_surface, text_rect)
-        
-        pygame.display.flip()
+        if world is not self.screen:
+            pygame.transform.scale(world, (WINDOW_WIDTH, WINDOW_HEIGHT), self.screen)
+    
+    def idle_timeout(self):
+        # How long the loop may block waiting for input, or None when something
+        # on screen is moving and the game has to tick at full rate
+        gm = self.game_manager
+        if not self.idle_sleep or gm.enemies or gm.projectiles or gm.effects or self.particles.count:
+            return None
+        if self.pan_direction() != (0, 0):
+            return None  # Camera is scrolling
+        if self.ui_manager.reward_display:
+            return None  # Reward text is fading out
+        if gm.game_state != "menu" and getattr(gm, 'boss_wave_notification', False):
+            return None  # Boss alert is flashing
+        if gm.game_state == "playing":
+            # Board is empty between spawns: sleep until the next enemy is due
+            next_spawn = gm.next_spawn_time()
+            if next_spawn is None:
+                return None
+            wait = next_spawn - gm.get_ticks()
+            return min(wait, IDLE_TIMEOUT_MS) if wait > 0 else None
+        return IDLE_TIMEOUT_MS
+    
+    def idle_step(self, timeout):
+        # Block until input arrives (or the timeout passes) instead of redrawing
+        # an unchanged screen 60 times a second
+        started = time.perf_counter()
+        event = pygame.event.wait(timeout)
+        events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+        self.handle_events(events)
+        # Nothing was moving, so the game time spent waiting passes in one jump
+        self.game_clock.advance(max((time.perf_counter() - started) * 1000 - TICK_MS, 0))
+        self.update()
+        if events or self.idle_timeout() is None:
+            self.draw()
+        self.pacer.reset()  # Restart frame timing; the wait isn't a slow frame
+    
+    def adapt_resolution(self, frame_ms):
+        if self.dynamic_resolution.record(frame_ms):
+            self.set_render_scale(self.dynamic_resolution.scale)
+            if self.frame_stats:
+                print(f"Render scale set to {self.view.scale}")  # Explains jumps in the frame-time reports
     
     def run(self):
         print("Starting game loop...")  # Debug output
+        # Show the first frame right away instead of waiting for the first event,
+        # then open the audio device and start decoding sounds behind it
+        self.draw()
+        self.mark_startup("first frame")
+        if self.startup_profile:
+            self.startup_profile.report()
+        self.audio.start()
+        self.pacer.reset()  # Startup isn't a slow frame
         while self.running:
             try:
+                timeout = self.idle_timeout()
+                if timeout is not None:
+                    self.frame = None  # Idle frames are drawn directly; the pipeline restarts after
+                    self.idle_step(timeout)
+                    continue
+                frame_start = time.perf_counter()
                 self.handle_events()
-                self.update()
-                self.draw()
-                self.clock.tick(FPS)
+                ticks = self.pacer.ticks_due()
+                if self.simulation_thread:
+                    self.pipelined_step(ticks)
+                else:
+                    self.update(ticks)
+                    self.draw()
+                if self.dynamic_resolution:
+                    self.adapt_resolution((time.perf_counter() - frame_start) * 1000)
+                self.pacer.wait()
+                if self.frame_stats and self.pacer.frames >= FRAME_STATS_FRAMES:
+                    self.pacer.report()
+                    self.pacer.reset_stats()
             except Exception as e:
                 print(f"Error in game loop: {e}")  # Debug output
                 import traceback
                 traceback.print_exc()
                 self.running = False
+        
+        if self.frame_stats:
+            self.pacer.report()
+        if self.autosaver:
+            self.autosaver.close()
+        if self.simulation_thread:
+            self.simulation_thread.shutdown()
+        if self.spectator:
+            self.spectator.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Kaiju Tower Defense")
+    parser.add_argument("--autosave", metavar="PATH",
+                        help="periodically save the run to PATH and resume from it on launch")
+    parser.add_argument("--hide-full-health-bars", action="store_true",
+                        help="only show health bars on damaged enemies")
+    parser.add_argument("--always-redraw", action="store_true",
+                        help="keep rendering at full rate even when nothing is moving")
+    parser.add_argument("--autosave-interval", type=int, default=15, metavar="SECONDS",
+                        help="seconds between autosaves (default: 15)")
+    parser.add_argument("--render-scale", type=float, default=1.0, metavar="SCALE",
+                        help="draw the playfield at this fraction of the window size, e.g. 0.75 (default: 1.0)")
+    parser.add_argument("--dynamic-resolution", action="store_true",
+                        help="lower the playfield scale automatically when frames run over budget")
+    parser.add_argument("--map", default=DEFAULT_MAP, choices=sorted(MAPS),
+                        help=f"map to play (default: {DEFAULT_MAP})")
+    parser.add_argument("--maze", action="store_true",
+                        help="let towers go anywhere on a grid; enemies find their own way around them")
+    parser.add_argument("--threaded", action="store_true",
+                        help="simulate the next tick on a second thread while the current frame is drawn")
+    parser.add_argument("--telemetry", metavar="PATH",
+                        help="append per-tower combat stats for every wave to PATH (JSON lines)")
+    parser.add_argument("--spectate", action="store_true",
+                        help="stream the game to spectator_viewer.py clients on another screen")
+    parser.add_argument("--spectate-host", default="127.0.0.1", metavar="HOST",
+                        help="address to accept spectators on, e.g. 0.0.0.0 for other machines (default: 127.0.0.1)")
+    parser.add_argument("--spectate-port", type=int, default=8765, metavar="PORT",
+                        help="port to accept spectators on (default: 8765)")
+    parser.add_argument("--spectate-rate", type=int, default=15, metavar="FPS",
+                        help="frames per second sent to spectators (default: 15)")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print the time to the first frame, broken down by startup stage")
+    parser.add_argument("--frame-stats", action="store_true",
+                        help=f"print frame-time jitter and game speed every {FRAME_STATS_FRAMES} frames, and render scale changes")
+    return parser.parse_args(argv)
 
 def main():
+    args = parse_args()
+    
     # Create assets directory if it doesn't exist
     if not os.path.exists('assets'):
         os.makedirs('assets')
         
-    game = Game()
+    Enemy.hide_full_health_bar = args.hide_full_health_bars
+    
+    spectator = None
+    if args.spectate:
+        from spectator import SpectatorServer
+        spectator = SpectatorServer(args.spectate_host, args.spectate_port, args.spectate_rate)
+        if not spectator.start():
+            spectator = None
+    
+    game = Game(autosave_path=args.autosave, autosave_interval=args.autosave_interval,
+                idle_sleep=not args.always_redraw, telemetry_path=args.telemetry,
+                render_scale=min(max(args.render_scale, 0.25), 1.0),
+                dynamic_resolution=args.dynamic_resolution, map_name=args.map, maze=args.maze,
+                threaded=args.threaded, startup_profile=STARTUP if args.startup_profile else None,
+                spectator=spectator, frame_stats=args.frame_stats)
     game.run()
     pygame.quit()
     sys.exit()
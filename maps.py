@@ -0,0 +1,33 @@
+import json
+import os
+from collections import namedtuple
+
+# Map layouts live in maps.json. Coordinates are world pixels; a map can be
+# larger than the window, in which case the camera scrolls over it. A map has
+# either one "path" or several "lanes", each a path with its own spawn point.
+MAPS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps.json")
+DEFAULT_MAP = "city"
+
+MapDefinition = namedtuple("MapDefinition", ["key", "name", "width", "height", "path", "lanes"])
+
+def load_map_definitions(path=MAPS_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compile_maps(definitions):
+    table = {}
+    for key, definition in definitions.items():
+        # Segments must be horizontal or vertical
+        lanes = tuple(tuple(tuple(point) for point in path)
+                      for path in definition.get("lanes") or [definition["path"]])
+        table[key] = MapDefinition(
+            key=key,
+            name=definition["name"],
+            width=definition["width"],
+            height=definition["height"],
+            path=lanes[0],
+            lanes=lanes
+        )
+    return table
+
+MAPS = compile_maps(load_map_definitions())
@@ -0,0 +1,214 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+from enemy import Enemy
+from placement_optimizer import candidate_positions
+from projectile import Projectile, Beam, HealEffect
+from simulation import HeadlessSimulation
+from tower import Tower, TOWER_TYPES
+from unit_stats import MAX_WAVES
+
+# Plays a long game without a window and watches memory at every wave
+# boundary, to catch the slow RSS creep seen on kiosk sessions. Between waves
+# the board is empty, so whatever is still allocated then should stay flat
+# from wave to wave; steady growth means something is being kept alive.
+#
+# By default the full game runs (Game.update and Game.draw on SDL's dummy
+# video driver). --logic-only runs just the GameManager.
+
+# Classes whose live instances are counted at each wave boundary. pygame's
+# Surface, Vector2 and Rect aren't tracked by the garbage collector, so those
+# are found through the objects that refer to them.
+TRACKED_CLASSES = (
+    ("Enemy", Enemy),
+    ("Tower", Tower),
+    ("Projectile", Projectile),
+    ("Beam", Beam),
+    ("HealEffect", HealEffect),
+)
+UNTRACKED_CLASSES = (
+    ("Surface", pygame.Surface),
+    ("Vector2", pygame.math.Vector2),
+    ("Rect", pygame.Rect),
+)
+SETTLE_WAVES = 2  # Caches fill up during the first waves; growth is measured after these
+IGNORED_FILES = (__file__, tracemalloc.__file__, "<frozen importlib._bootstrap>",
+                 "<frozen importlib._bootstrap_external>", "<unknown>")
+
+def count_live_objects():
+    counts = dict.fromkeys([name for name, _ in TRACKED_CLASSES + UNTRACKED_CLASSES], 0)
+    untracked = {cls: name for name, cls in UNTRACKED_CLASSES}
+    seen = set()
+    for obj in gc.get_objects():
+        for name, cls in TRACKED_CLASSES:
+            if isinstance(obj, cls):
+                counts[name] += 1
+        for referent in gc.get_referents(obj):
+            name = untracked.get(type(referent))
+            if name and id(referent) not in seen:
+                seen.add(id(referent))
+                counts[name] += 1
+    return counts
+
+def resident_kb():
+    # Current RSS where /proc is available, otherwise None
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class ScriptedBuyer:
+    # Deterministic stand-in for a player: every wave prep it buys the most
+    # expensive tower it can afford, filling the optimizer's candidate spots in
+    # order, nearest a lane first. With a plan file it replays that plan instead.
+    def __init__(self, game_manager, plan=None):
+        self.plan = plan
+        self.positions = candidate_positions(game_manager)
+        self.next_position = 0
+
+    def buy(self, game_manager):
+        if self.plan is not None:
+            for purchase in self.plan:
+                if purchase["wave"] == game_manager.current_wave + 1:
+                    self._place(game_manager, TOWER_TYPES[purchase["tower"]], (purchase["x"], purchase["y"]))
+            return
+        by_cost = sorted(TOWER_TYPES.values(), key=lambda tower_class: -tower_class.stats.cost)
+        while self.next_position < len(self.positions) and len(game_manager.towers) < game_manager.max_towers:
+            tower_class = next((tower_class for tower_class in by_cost
+                                if tower_class.stats.cost <= game_manager.cash), None)
+            if tower_class is None:
+                return
+            position = self.positions[self.next_position]
+            self.next_position += 1
+            self._place(game_manager, tower_class, position)
+
+    def _place(self, game_manager, tower_class, position):
+        if game_manager.cash >= tower_class.stats.cost and game_manager.can_place_tower(position):
+            game_manager.add_tower(tower_class(position[0], position[1]))
+            game_manager.cash -= tower_class.stats.cost
+
+def make_session(args):
+    # Returns (game manager, function that advances one frame)
+    if args.logic_only:
+        simulation = HeadlessSimulation(args.seed, cash=args.cash)
+        return simulation.game_manager, simulation.step
+
+    import main
+    game = main.Game()
+    gm = game.game_manager
+    gm.rng.seed(args.seed)
+    gm.game_state = "wave_prep"
+    gm.cash = args.cash
+
+    def step():
+        game.update()  # One fixed tick of the game's own clock
+        game.draw()
+    return gm, step
+
+def top_sites(snapshot, baseline, limit):
+    filters = [tracemalloc.Filter(False, filename) for filename in IGNORED_FILES]
+    snapshot = snapshot.filter_traces(filters)
+    baseline = baseline.filter_traces(filters)
+    return [stat for stat in snapshot.compare_to(baseline, "lineno") if stat.size_diff > 0][:limit]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Profile memory across a long headless game")
+    parser.add_argument("--waves", type=int, default=MAX_WAVES, help=f"waves to play (default: {MAX_WAVES})")
+    parser.add_argument("--cash", type=int, default=5000, help="starting cash for the scripted player (default: 5000)")
+    parser.add_argument("--plan", metavar="PATH", help="replay the best layout from a placement_optimizer.py results file")
+    parser.add_argument("--budget", type=int, default=500, help="budget entry of the plan to replay (default: 500)")
+    parser.add_argument("--seed", type=int, default=0, help="game RNG seed (default: 0)")
+    parser.add_argument("--logic-only", action="store_true", help="skip Game.update/Game.draw and run only the GameManager")
+    parser.add_argument("--frames", type=int, default=25, help="stack frames kept per allocation (default: 25)")
+    parser.add_argument("--top", type=int, default=10, help="allocation sites to report (default: 10)")
+    parser.add_argument("--max-growth-kb", type=int, default=512,
+                        help="fail if traced memory grows more than this after the first waves (default: 512)")
+    parser.add_argument("--json", metavar="PATH", help="also write the per-wave measurements to PATH")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Set here rather than on import, so importing resident_kb() leaves a real display alone
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    plan = None
+    if args.plan:
+        with open(args.plan) as f:
+            plan = json.load(f)[str(args.budget)][0]["purchases"]
+        args.cash = args.budget
+
+    tracemalloc.start(args.frames)
+    gm, step = make_session(args)
+    buyer = ScriptedBuyer(gm, plan)
+    start = time.perf_counter()
+    samples = []
+    baseline = None
+    while gm.current_wave < args.waves and gm.game_state == "wave_prep":
+        buyer.buy(gm)
+        gm.start_wave()
+        while gm.game_state == "playing":
+            step()
+
+        # Wave boundary: measure with nothing but garbage left to free
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        sample = {
+            "wave": gm.current_wave,
+            "state": gm.game_state,
+            "traced_kb": current // 1024,
+            "peak_kb": peak // 1024,
+            "rss_kb": resident_kb(),
+            "objects": count_live_objects(),
+        }
+        samples.append(sample)
+        counts = " ".join(f"{name}={count}" for name, count in sample["objects"].items())
+        print(f"Wave {sample['wave']:>2}: traced {sample['traced_kb']} KB, peak {sample['peak_kb']} KB, "
+              f"RSS {sample['rss_kb']} KB, {counts}")
+        if len(samples) == SETTLE_WAVES:
+            baseline = tracemalloc.take_snapshot()
+
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    print(f"Played {len(samples)} waves in {time.perf_counter() - start:.1f}s, ending in state '{gm.game_state}'")
+
+    if baseline is None:
+        print("Not enough waves to measure growth")
+        return 0
+
+    settled = samples[SETTLE_WAVES - 1]
+    growth_kb = samples[-1]["traced_kb"] - settled["traced_kb"]
+    print(f"\nTop allocation sites still held since wave {settled['wave']}:")
+    for stat in top_sites(final, baseline, args.top):
+        frame = stat.traceback[0]
+        print(f"  {stat.size_diff / 1024:+8.1f} KB {stat.count_diff:+6d} blocks  {frame.filename}:{frame.lineno}")
+
+    growing = [name for name in settled["objects"]
+               if samples[-1]["objects"][name] > settled["objects"][name]]
+    print(f"\nTraced memory grew {growth_kb} KB between waves {settled['wave']} and {samples[-1]['wave']}"
+          f" (limit {args.max_growth_kb} KB)")
+    if growing:
+        print("More live objects at the end than after settling: " + ", ".join(
+            f"{name} {settled['objects'][name]} -> {samples[-1]['objects'][name]}" for name in growing))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(samples, f, indent=2)
+
+    if growth_kb > args.max_growth_kb:
+        print("Verdict: LEAK SUSPECTED")
+        return 1
+    print("Verdict: no leak detected")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
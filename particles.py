@@ -0,0 +1,138 @@
+from collections import namedtuple
+import numpy as np
+import pygame
+
+# Short-lived sparks and debris for explosions, hits, deaths and boss
+# abilities. Particles aren't objects: they live in fixed-size NumPy arrays
+# (live ones packed at the front) that are moved, aged and compacted with a
+# few array operations per frame, then written straight into the surface's
+# pixels. Purely visual; the game logic never reads them.
+MAX_PARTICLES = 4096  # Hard budget
+SOFT_LIMIT = MAX_PARTICLES // 2  # Above this, new bursts are thinned out towards zero
+MAX_STEP_MS = 100  # Longer gaps (e.g. after idling) don't fling particles across the map
+DRAG = 0.996  # Velocity kept per ms
+
+# count, speed in px/ms, lifetime in ms, dot size in world px, colors to pick from
+Burst = namedtuple("Burst", ["count", "speed", "life_ms", "size", "colors"])
+BURSTS = {
+    "explosion": Burst(40, 0.25, 500, 3, ((255, 200, 60), (255, 120, 20), (200, 60, 20))),
+    "beam_hit": Burst(2, 0.12, 200, 2, ((150, 220, 255), (255, 255, 255))),
+    "death": Burst(24, 0.15, 600, 3, ((180, 180, 180), (120, 200, 90), (220, 80, 60))),
+    "damage_base": Burst(30, 0.2, 700, 3, ((255, 60, 40), (255, 160, 60))),
+    "lightning_attack": Burst(50, 0.35, 400, 2, ((200, 220, 255), (255, 255, 160))),
+    "roar": Burst(60, 0.3, 600, 2, ((255, 240, 200), (200, 180, 140))),
+    "aoe_attack": Burst(80, 0.3, 700, 3, ((255, 90, 30), (255, 180, 40))),
+    "summon_minions": Burst(40, 0.1, 900, 3, ((170, 80, 220), (90, 40, 160))),
+    "spawn_crystal": Burst(12, 0.08, 500, 2, ((120, 230, 255), (200, 255, 255))),
+}
+
+class ParticleSystem:
+    def __init__(self, capacity=MAX_PARTICLES, seed=None):
+        self.capacity = capacity
+        self.count = 0  # Live particles are [0, count)
+        self.position = np.zeros((capacity, 2), np.float32)
+        self.velocity = np.zeros((capacity, 2), np.float32)
+        self.life = np.zeros(capacity, np.float32)  # ms left
+        self.max_life = np.ones(capacity, np.float32)
+        self.color = np.zeros((capacity, 3), np.float32)
+        self.size = np.ones(capacity, np.int32)
+        self.rng = np.random.default_rng(seed)  # Separate from the game RNG so replays stay identical
+        self.last_update = None
+        self.dropped = 0  # Particles skipped to stay within budget
+
+    def emit(self, kind, position):
+        burst = BURSTS[kind]
+        count = burst.count
+        if self.count > SOFT_LIMIT:
+            # Degrade gracefully: the fuller the arrays, the sparser new bursts get
+            count = int(count * (self.capacity - self.count) / (self.capacity - SOFT_LIMIT))
+        count = min(count, self.capacity - self.count)
+        self.dropped += burst.count - count
+        if count <= 0:
+            return
+        start, end = self.count, self.count + count
+        rng = self.rng
+        angle = rng.uniform(0, 2 * np.pi, count)
+        speed = rng.uniform(0.3, 1.0, count) * burst.speed
+        self.position[start:end] = position
+        self.velocity[start:end, 0] = np.cos(angle) * speed
+        self.velocity[start:end, 1] = np.sin(angle) * speed
+        life = rng.uniform(0.5, 1.0, count) * burst.life_ms
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        self.color[start:end] = np.asarray(burst.colors, np.float32)[rng.integers(0, len(burst.colors), count)]
+        self.size[start:end] = burst.size
+        self.count = end
+
+    def update(self, current_time):
+        elapsed = 0 if self.last_update is None else min(current_time - self.last_update, MAX_STEP_MS)
+        self.last_update = current_time
+        count = self.count
+        if not count or elapsed <= 0:
+            return
+        self.position[:count] += self.velocity[:count] * elapsed
+        self.velocity[:count] *= DRAG ** elapsed
+        self.life[:count] -= elapsed
+
+        # Compact: move the survivors to the front in one pass per array
+        alive = self.life[:count] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors < count:
+            for array in (self.position, self.velocity, self.life, self.max_life, self.color, self.size):
+                array[:survivors] = array[:count][alive]
+            self.count = survivors
+
+    def clear(self):
+        self.count = 0
+
+    def copy(self):
+        # The live particles only, for drawing while this system keeps updating
+        copy = object.__new__(ParticleSystem)
+        copy.__dict__.update(self.__dict__)
+        for name in ("position", "velocity", "life", "max_life", "color", "size"):
+            setattr(copy, name, getattr(self, name)[:self.count].copy())
+        copy.capacity = self.count
+        return copy
+
+    def draw(self, surface, view):
+        count = self.count
+        if not count:
+            return
+        origin = np.asarray(view.origin, np.float32)
+        points = ((self.position[:count] - origin) * view.scale).astype(np.int32)
+        sizes = np.maximum(1, (self.size[:count] * view.scale).astype(np.int32))
+        # Fade out over the particle's life by blending towards what is underneath
+        alpha = self.life[:count] / self.max_life[:count]
+        keep = 1 - alpha
+        width, height = surface.get_size()
+        if surface.get_bytesize() != 4:
+            # No packed 32-bit pixels to write into: draw the dots one by one
+            for (x, y), size, color in zip(points.tolist(), sizes.tolist(), self.color[:count].tolist()):
+                surface.fill(color, (x, y, size, size))
+            return
+
+        # Every dot is a size x size square: expand all of them to pixels at once
+        span = int(sizes.max())
+        offset_x, offset_y = np.divmod(np.arange(span * span, dtype=np.int32), span)
+        xs = (points[:, 0, None] + offset_x).ravel()
+        ys = (points[:, 1, None] + offset_y).ravel()
+        mask = ((np.maximum(offset_x, offset_y) < sizes[:, None]).ravel()
+                & (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height))
+        drawn = np.flatnonzero(mask)
+        owner = drawn // (span * span)  # Particle each pixel belongs to
+        xs, ys = xs.take(drawn), ys.take(drawn)
+        pixel_keep = keep.take(owner)
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            under = pixels[xs, ys]
+            result = np.zeros(len(under), np.uint32)
+            # One flat pass per channel; much faster than broadcasting over an (n, 3) array
+            for channel, shift in enumerate(surface.get_shifts()[:3]):
+                tint = (self.color[:count, channel] * alpha).take(owner)
+                value = ((under >> np.uint32(shift)) & np.uint32(255)).astype(np.float32)
+                value *= pixel_keep
+                value += tint
+                result |= value.astype(np.uint32) << np.uint32(shift)
+            pixels[xs, ys] = result
+        finally:
+            del pixels  # Unlocks the surface
@@ -0,0 +1,204 @@
+import heapq
+from collections import deque
+from pygame.math import Vector2
+
+# Maze mode: towers snap to a grid and block the cell they stand on, and
+# enemies walk around them to the nearest exit. Instead of every enemy running
+# its own search, one distance field (steps to an exit for every cell) and flow
+# field (the neighbour to step to next) is shared by all of them. Placing or
+# selling a tower only repairs the cells whose distance actually changes.
+GRID_SIZE = 40  # One tower per cell
+UNREACHABLE = 1 << 30
+
+class FlowField:
+    def __init__(self, world_size, starts, exits):
+        # starts, exits: positions of every lane's spawn point and exit
+        self.cols = -(-world_size[0] // GRID_SIZE)
+        self.rows = -(-world_size[1] // GRID_SIZE)
+        count = self.cols * self.rows
+        self.blocked = bytearray(count)
+        self.distance = [UNREACHABLE] * count
+        self.flow = [-1] * count  # Next cell toward the exit, -1 if there is none
+        self.centers = [Vector2((index % self.cols + 0.5) * GRID_SIZE, (index // self.cols + 0.5) * GRID_SIZE)
+                        for index in range(count)]
+        self.neighbors = [self._neighbors_of(index) for index in range(count)]
+        self.starts = {self.cell_of(start) for start in starts}
+        self.exits = {self.cell_of(exit) for exit in exits}
+        self.version = 0  # Bumped on every change; placement checks are cached per version
+        self._reach_cache = {}
+        self.rebuild(())
+
+    def _neighbors_of(self, index):
+        x, y = index % self.cols, index // self.cols
+        cells = []
+        if x + 1 < self.cols:
+            cells.append(index + 1)
+        if x > 0:
+            cells.append(index - 1)
+        if y + 1 < self.rows:
+            cells.append(index + self.cols)
+        if y > 0:
+            cells.append(index - self.cols)
+        return tuple(cells)
+
+    def cell_of(self, position):
+        x = min(max(int(position[0]) // GRID_SIZE, 0), self.cols - 1)
+        y = min(max(int(position[1]) // GRID_SIZE, 0), self.rows - 1)
+        return y * self.cols + x
+
+    def snap(self, position):
+        center = self.centers[self.cell_of(position)]
+        return (int(center.x), int(center.y))
+
+    def rebuild(self, blocked_positions):
+        # Full breadth-first search from the exit (used at start and after loading a save)
+        self.blocked = bytearray(len(self.blocked))
+        for position in blocked_positions:
+            self.blocked[self.cell_of(position)] = 1
+        distance = self.distance = [UNREACHABLE] * len(self.blocked)
+        for exit in self.exits:
+            distance[exit] = 0
+        queue = deque(self.exits)
+        while queue:
+            cell = queue.popleft()
+            step = distance[cell] + 1
+            for neighbor in self.neighbors[cell]:
+                if not self.blocked[neighbor] and distance[neighbor] > step:
+                    distance[neighbor] = step
+                    queue.append(neighbor)
+        self._update_flow(range(len(self.blocked)))
+        self._changed()
+
+    def _update_flow(self, cells):
+        distance, flow, neighbors, blocked = self.distance, self.flow, self.neighbors, self.blocked
+        for cell in cells:
+            if blocked[cell]:
+                flow[cell] = -1
+                continue
+            best, best_distance = -1, distance[cell]
+            for neighbor in neighbors[cell]:
+                if distance[neighbor] < best_distance:
+                    best, best_distance = neighbor, distance[neighbor]
+            flow[cell] = best
+
+    def _changed(self):
+        self.version += 1
+        self._reach_cache.clear()
+
+    def _relax(self, heap):
+        # Dijkstra over unit steps from the seeded cells; returns every cell that improved
+        distance, blocked, neighbors = self.distance, self.blocked, self.neighbors
+        improved = set()
+        while heap:
+            cell_distance, cell = heapq.heappop(heap)
+            if cell_distance > distance[cell]:
+                continue
+            improved.add(cell)
+            step = cell_distance + 1
+            for neighbor in neighbors[cell]:
+                if not blocked[neighbor] and distance[neighbor] > step:
+                    distance[neighbor] = step
+                    heapq.heappush(heap, (step, neighbor))
+        return improved
+
+    def block(self, position):
+        cell = self.cell_of(position)
+        if self.blocked[cell]:
+            return
+        # Only cells whose route ran through this one can get longer: find them
+        # by walking the flow field backwards, forget their distances, then
+        # refill them from the untouched cells around them
+        affected = {cell}
+        stack = [cell]
+        while stack:
+            current = stack.pop()
+            for neighbor in self.neighbors[current]:
+                if self.flow[neighbor] == current and neighbor not in affected:
+                    affected.add(neighbor)
+                    stack.append(neighbor)
+        self.blocked[cell] = 1
+        distance = self.distance
+        for current in affected:
+            distance[current] = UNREACHABLE
+        heap = []
+        for current in affected:
+            if current == cell:
+                continue
+            best = min([distance[neighbor] for neighbor in self.neighbors[current]
+                        if neighbor not in affected], default=UNREACHABLE) + 1
+            if best < UNREACHABLE:
+                distance[current] = best
+                heap.append((best, current))
+        heapq.heapify(heap)
+        self._relax(heap)
+        self._update_flow(affected)
+        self._changed()
+
+    def unblock(self, position):
+        cell = self.cell_of(position)
+        if not self.blocked[cell]:
+            return
+        # Distances can only shrink: spread the improvement out from the freed cell
+        self.blocked[cell] = 0
+        best = min(self.distance[neighbor] for neighbor in self.neighbors[cell]) + 1
+        improved = set()
+        if best < self.distance[cell]:
+            self.distance[cell] = best
+            improved = self._relax([(best, cell)])
+        improved.add(cell)
+        around = set(improved)
+        for current in improved:
+            around.update(self.neighbors[current])
+        self._update_flow(around)
+        self._changed()
+
+    def reachable_without(self, cell):
+        # Cells that could still reach the exit if `cell` were blocked (cached per field version)
+        reach = self._reach_cache.get(cell)
+        if reach is None:
+            reach = bytearray(len(self.blocked))
+            exits = self.exits - {cell}
+            for exit in exits:
+                reach[exit] = 1
+            queue = deque(exits)
+            while queue:
+                current = queue.popleft()
+                for neighbor in self.neighbors[current]:
+                    if not reach[neighbor] and not self.blocked[neighbor] and neighbor != cell:
+                        reach[neighbor] = 1
+                        queue.append(neighbor)
+            self._reach_cache[cell] = reach
+        return reach
+
+    def can_block(self, position, enemies=()):
+        # A tower may not wall off a spawn point or any enemy already on the board
+        cell = self.cell_of(position)
+        if self.blocked[cell] or cell in self.starts or cell in self.exits:
+            return False
+        enemy_cells = [self.cell_of(enemy.position) for enemy in enemies]
+        if cell in enemy_cells:
+            return False
+        if self.distance[cell] >= UNREACHABLE:
+            return True  # Not on anyone's route
+        reach = self.reachable_without(cell)
+        return (all(reach[start] for start in self.starts)
+                and all(reach[enemy_cell] for enemy_cell in enemy_cells))
+
+    def move(self, enemy):
+        # Maze-mode replacement for Enemy.move(); returns True once an exit is reached
+        cell = self.cell_of(enemy.position)
+        if cell in self.exits:
+            return True
+        next_cell = self.flow[cell]
+        if next_cell < 0:
+            return False  # Walled in; placement rules keep this from happening
+        direction = self.centers[next_cell] - enemy.position
+        speed = enemy.speed
+        if "slow" in enemy.effects:
+            speed *= 1 - enemy.effects["slow"]["amount"]
+        if direction.length() <= speed:
+            enemy.position = Vector2(self.centers[next_cell])
+        else:
+            enemy.position += direction.normalize() * speed
+        enemy.rect.center = enemy.position
+        return False
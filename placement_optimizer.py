@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from pygame.math import Vector2
+from game_manager import GameManager
+from simulation import HeadlessSimulation
+from tower import TOWER_TYPES
+
+# Monte-Carlo search over tower layouts and purchase orders.
+#
+# A plan is a list with one entry per wave: the towers bought (kind, x, y)
+# during the prep phase before that wave. Each candidate keeps a prefix of the
+# best plan found so far and fills in the remaining waves with random
+# purchases, so candidates share early waves. Workers cache a checkpoint after
+# every wave keyed by the purchases that led to it, and resume from the
+# longest cached prefix instead of re-simulating it.
+GRID_SPACING = 40
+MAX_PATH_DISTANCE = 150  # Farther than this from every lane, no tower can reach an enemy
+PREFIX_CACHE_SIZE = 256
+
+def distance_to_path(point, path):
+    best = float("inf")
+    point = Vector2(point)
+    for start, end in zip(path, path[1:]):
+        start, end = Vector2(start), Vector2(end)
+        line = end - start
+        t = max(0, min(1, (point - start).dot(line) / line.length_squared()))
+        best = min(best, (point - (start + line * t)).length())
+    return best
+
+def candidate_positions(game_manager):
+    # Free grid spots on the game manager's map that a tower could reach enemies
+    # from, nearest a lane first. In maze mode towers only stand on flow field
+    # cells and enemies leave the lanes, so every free cell counts.
+    if game_manager.flow_field:
+        points = [(int(center.x), int(center.y)) for center in game_manager.flow_field.centers]
+    else:
+        width, height = game_manager.world_size
+        points = [(x, y) for x in range(GRID_SPACING // 2, width, GRID_SPACING)
+                  for y in range(GRID_SPACING // 2, height, GRID_SPACING)]
+    spots = []
+    for point in points:
+        if not game_manager.can_place_tower(point):
+            continue
+        distance = min(distance_to_path(point, lane.path) for lane in game_manager.lanes)
+        if game_manager.maze or distance <= MAX_PATH_DISTANCE:
+            spots.append((distance, point))
+    return [point for _, point in sorted(spots)]
+
+def plan_key(plan):
+    return tuple(tuple(purchases) for purchases in plan)
+
+def plan_score(waves_cleared, base_hp):
+    # Every cleared wave beats any amount of remaining base HP
+    return waves_cleared + max(base_hp, 0) / 1000
+
+# Per-worker state
+_positions = None
+_prefix_cache = OrderedDict()
+
+def _init_worker():
+    global _positions
+    _positions = candidate_positions(GameManager())  # The map every candidate is simulated on
+
+def _random_purchases(simulation, rng, buy_chance):
+    gm = simulation.game_manager
+    purchases = []
+    while len(gm.towers) < gm.max_towers and rng.random() < buy_chance:
+        affordable = [kind for kind, tower_class in TOWER_TYPES.items()
+                      if tower_class.stats.cost <= gm.cash]
+        if not affordable:
+            break
+        kind = rng.choice(affordable)
+        for _ in range(10):  # A few tries to find a free spot
+            position = rng.choice(_positions)
+            if simulation.buy_tower(TOWER_TYPES[kind], position):
+                purchases.append((kind, position[0], position[1]))
+                break
+    return purchases
+
+def evaluate(job):
+    budget, seed, waves, prefix, rollout_seed, buy_chance, reference_hp, prune_margin = job
+    if _positions is None:
+        _init_worker()
+
+    # Resume from the longest prefix this worker has already simulated
+    simulation = None
+    start = 0
+    for length in range(len(prefix), 0, -1):
+        key = (budget, seed, plan_key(prefix[:length]))
+        if key in _prefix_cache:
+            _prefix_cache.move_to_end(key)
+            simulation = HeadlessSimulation.from_checkpoint(_prefix_cache[key])
+            start = length
+            break
+    if simulation is None:
+        simulation = HeadlessSimulation(seed, cash=budget)
+
+    rng = random.Random(rollout_seed)
+    gm = simulation.game_manager
+    plan = [list(purchases) for purchases in prefix[:start]]
+    pruned = False
+    for wave_index in range(start, waves):
+        if wave_index < len(prefix):
+            purchases = [purchase for purchase in prefix[wave_index]
+                         if simulation.buy_tower(TOWER_TYPES[purchase[0]], purchase[1:])]
+        else:
+            purchases = _random_purchases(simulation, rng, buy_chance)
+        plan.append(purchases)
+
+        if simulation.run_wave() != "wave_prep":
+            break  # Lost, or won the whole game
+        _prefix_cache[(budget, seed, plan_key(plan))] = simulation.checkpoint()
+        if len(_prefix_cache) > PREFIX_CACHE_SIZE:
+            _prefix_cache.popitem(last=False)
+
+        # Base HP never comes back, so a run far behind the best one is hopeless
+        if wave_index < len(reference_hp) and gm.base_hp < reference_hp[wave_index] - prune_margin:
+            pruned = True
+            break
+
+    cleared = gm.current_wave if gm.game_state in ("wave_prep", "victory") else gm.current_wave - 1
+    return {
+        "score": plan_score(cleared, gm.base_hp),
+        "waves_cleared": cleared,
+        "base_hp": gm.base_hp,
+        "cash_left": gm.cash,
+        "pruned": pruned,
+        "plan": plan,
+    }
+
+def _hp_curve(seed, budget, plan):
+    # Base HP after each wave of a finished plan, used to prune later candidates
+    simulation = HeadlessSimulation(seed, cash=budget)
+    curve = []
+    for purchases in plan:
+        for kind, x, y in purchases:
+            simulation.buy_tower(TOWER_TYPES[kind], (x, y))
+        if simulation.run_wave() != "wave_prep":
+            break
+        curve.append(simulation.game_manager.base_hp)
+    return curve
+
+def optimize_budget(pool, args, budget, rng):
+    best = []  # Top results so far, best first
+    reference_hp = []
+    for round_number in range(args.rounds):
+        jobs = []
+        for _ in range(args.candidates):
+            prefix = []
+            if best and rng.random() >= args.explore:
+                # Keep the start of a good plan and re-roll the rest
+                parent = rng.choice(best)["plan"]
+                prefix = parent[:rng.randrange(len(parent) + 1)]
+            jobs.append((budget, args.seed, args.waves, prefix, rng.getrandbits(32),
+                         args.buy_chance, reference_hp, args.prune_margin))
+        # Jobs with the same prefix land next to each other, and so mostly in
+        # the same chunk, where the worker's prefix cache can reuse them
+        jobs.sort(key=lambda job: plan_key(job[3]))
+        chunksize = max(1, len(jobs) // (args.workers * 4))
+        results = list(pool.map(evaluate, jobs, chunksize=chunksize))
+
+        best = sorted(best + results, key=lambda result: -result["score"])[:args.top]
+        reference_hp = _hp_curve(args.seed, budget, best[0]["plan"])
+        pruned = sum(result["pruned"] for result in results)
+        print(f"Budget {budget}, round {round_number + 1}/{args.rounds}: "
+              f"best {best[0]['waves_cleared']} waves, {best[0]['base_hp']} HP "
+              f"({pruned}/{len(results)} candidates pruned)")
+    return best
+
+def format_plan(plan):
+    return [{"wave": wave_index + 1, "tower": kind, "x": x, "y": y}
+            for wave_index, purchases in enumerate(plan)
+            for kind, x, y in purchases]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Search for strong tower layouts with headless simulations")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[500],
+                        help="starting cash values to optimize for (default: 500)")
+    parser.add_argument("--waves", type=int, default=10, help="waves to simulate per candidate (default: 10)")
+    parser.add_argument("--candidates", type=int, default=64, help="candidates per round (default: 64)")
+    parser.add_argument("--rounds", type=int, default=4, help="search rounds per budget (default: 4)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="game RNG seed shared by every candidate (default: 0)")
+    parser.add_argument("--top", type=int, default=3, help="layouts to report per budget (default: 3)")
+    parser.add_argument("--explore", type=float, default=0.25,
+                        help="share of candidates planned from scratch after the first round (default: 0.25)")
+    parser.add_argument("--buy-chance", type=float, default=0.7,
+                        help="chance to buy another tower during a random prep phase (default: 0.7)")
+    parser.add_argument("--prune-margin", type=int, default=30,
+                        help="stop a candidate once its base HP falls this far behind the best run (default: 30)")
+    parser.add_argument("--output", metavar="PATH", help="write the results as JSON to PATH instead of stdout")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        for budget in args.budgets:
+            results[str(budget)] = [
+                {
+                    "score": round(result["score"], 3),
+                    "waves_cleared": result["waves_cleared"],
+                    "base_hp": result["base_hp"],
+                    "cash_left": result["cash_left"],
+                    "purchases": format_plan(result["plan"]),
+                }
+                for result in optimize_budget(pool, args, budget, rng)
+            ]
+    print(f"Search finished in {time.perf_counter() - start:.1f}s")
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -1,108 +1,134 @@
-import pygame
-from pygame.math import Vector2
-import math
-
-class Projectile:
-    def __init__(self, start_pos, target_pos, damage, speed=10):
-        self.position = Vector2(start_pos)
-        self.target = Vector2(target_pos)
-        self.damage = damage
-        self.speed = speed
-        self.is_active = True
-        self.rect = pygame.Rect(self.position.x - 3, self.position.y - 3, 6, 6)
-    
-    def update(self):
-        if not self.is_active:
-            return False
-        
-        direction = self.target - self.position
-        if direction.length() <= self.speed:
-            self.position = Vector2(self.target)
-            self.is_active = False
-            return True
-        
-        direction = direction.normalize() * self.speed
-        self.position += direction
-        self.rect.center = self.position
-        return False
-    
-    def draw(self, screen):
-        if not self.is_active:
-            return
-        pygame.draw.circle(screen, (255, 255, 0), 
-                         (int(self.position.x), int(self.position.y)), 3)
-
-class Bullet(Projectile):
-    def __init__(self, start_pos, target_pos, damage):
-        super().__init__(start_pos, target_pos, damage, speed=10)
-
-class Maser(Projectile):
-    def __init__(self, start_pos, target_pos, damage, effect):
-        super().__init__(start_pos, target_pos, damage, speed=15)
-        self.effect = effect
-    
-    def draw(self, screen):
-        if not self.is_active:
-            return
-        pygame.draw.circle(screen, (0, 255, 255), 
-                         (int(self.position.x), int(self.position.y)), 4)
-
-class Missile(Projectile):
-    def __init__(self, start_pos, target_pos, damage, aoe_radius):
-        super().__init__(start_pos, target_pos, damage, speed=8)
-        self.aoe_radius = aoe_radius
-    
-    def draw(self, screen):
-        if not self.is_active:
-            return
-        pygame.draw.circle(screen, (255, 100, 0), 
-                         (int(self.position.x), int(self.position.y)), 5)
-
-class Beam:
-    def __init__(self, start_pos, end_pos, damage, width):
-        self.start = Vector2(start_pos)
-        self.end = Vector2(end_pos)
-        self.damage = damage
-        self.width = width
-        self.duration = 100  # Duration in milliseconds
-        self.start_time = pygame.time.get_ticks()
-        self.is_active = True
-    
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.start_time >= self.duration:
-            self.is_active = False
-        return self.is_active
-    
-    def draw(self, screen):
-        if not self.is_active:
-            return
-        pygame.draw.line(screen, (255, 0, 255), 
-                        (self.start.x, self.start.y),
-                        (self.end.x, self.end.y), 
-                        self.width)
-
-class HealEffect:
-    def __init__(self, position, range, heal_amount):
-        self.position = Vector2(position)
-        self.range = range
-        self.heal_amount = heal_amount
-        self.duration = 500  # Duration in milliseconds
-        self.start_time = pygame.time.get_ticks()
-        self.is_active = True
-    
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.start_time >= self.duration:
-            self.is_active = False
-        return self.is_active
-    
-    def draw(self, screen):
-        if not self.is_active:
-            return
-        alpha = 128 * (1 - (pygame.time.get_ticks() - self.start_time) / self.duration)
-        surface = pygame.Surface((self.range * 2, self.range * 2), pygame.SRCALPHA)
-        pygame.draw.circle(surface, (0, 255, 0, int(alpha)), 
-                         (self.range, self.range), self.range)
-        screen.blit(surface, 
-                   (self.position.x - self.range, self.position.y - self.range)) 
\ No newline at end of file
+import pygame
+from pygame.math import Vector2
+import math
+from render_cache import get_circle_overlay
+from viewport import NATIVE_VIEW
+
+class Projectile:
+    __slots__ = ("position", "target", "damage", "speed", "is_active", "rect", "kind", "source")
+
+    def __init__(self, start_pos, target_pos, damage, speed=10):
+        self.kind = "projectile"
+        self.position = Vector2(start_pos)
+        self.target = Vector2(target_pos)
+        self.damage = damage
+        self.speed = speed
+        self.is_active = True
+        self.rect = pygame.Rect(self.position.x - 3, self.position.y - 3, 6, 6)
+        self.source = None  # Telemetry slot of the tower that fired it
+    
+    def update(self):
+        if not self.is_active:
+            return False
+        
+        direction = self.target - self.position
+        if direction.length() <= self.speed:
+            self.position = Vector2(self.target)
+            self.is_active = False
+            return True
+        
+        direction = direction.normalize() * self.speed
+        self.position += direction
+        self.rect.center = self.position
+        return False
+    
+    def draw(self, screen, view=NATIVE_VIEW):
+        if not self.is_active:
+            return
+        pygame.draw.circle(screen, (255, 255, 0), 
+                         view.point(self.position), view.length(3))
+
+class Bullet(Projectile):
+    __slots__ = ()
+
+    def __init__(self, start_pos, target_pos, damage):
+        super().__init__(start_pos, target_pos, damage, speed=10)
+        self.kind = "bullet"
+
+class Maser(Projectile):
+    __slots__ = ("effect",)
+
+    def __init__(self, start_pos, target_pos, damage, effect):
+        super().__init__(start_pos, target_pos, damage, speed=15)
+        self.kind = "maser"
+        self.effect = effect
+    
+    def draw(self, screen, view=NATIVE_VIEW):
+        if not self.is_active:
+            return
+        pygame.draw.circle(screen, (0, 255, 255), 
+                         view.point(self.position), view.length(4))
+
+class Missile(Projectile):
+    __slots__ = ("aoe_radius",)
+
+    def __init__(self, start_pos, target_pos, damage, aoe_radius):
+        super().__init__(start_pos, target_pos, damage, speed=8)
+        self.kind = "missile"
+        self.aoe_radius = aoe_radius
+    
+    def draw(self, screen, view=NATIVE_VIEW):
+        if not self.is_active:
+            return
+        pygame.draw.circle(screen, (255, 100, 0), 
+                         view.point(self.position), view.length(5))
+
+class Beam:
+    __slots__ = ("start", "end", "damage", "width", "duration", "start_time", "is_active", "kind",
+                 "source")
+
+    def __init__(self, start_pos, end_pos, damage, width, start_time=None):
+        self.kind = "beam"
+        self.start = Vector2(start_pos)
+        self.end = Vector2(end_pos)
+        self.damage = damage
+        self.width = width
+        self.duration = 100  # Duration in milliseconds
+        self.start_time = pygame.time.get_ticks() if start_time is None else start_time
+        self.is_active = True
+        self.source = None  # Telemetry slot of the tower that fired it
+    
+    def update(self, current_time=None):
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
+        if current_time - self.start_time >= self.duration:
+            self.is_active = False
+        return self.is_active
+    
+    def draw(self, screen, view=NATIVE_VIEW):
+        if not self.is_active:
+            return
+        pygame.draw.line(screen, (255, 0, 255), 
+                        view.point(self.start),
+                        view.point(self.end), 
+                        view.length(self.width))
+
+class HealEffect:
+    __slots__ = ("position", "range", "heal_amount", "duration", "start_time", "is_active", "kind")
+
+    def __init__(self, position, range, heal_amount, start_time=None):
+        self.kind = "heal"
+        self.position = Vector2(position)
+        self.range = range
+        self.heal_amount = heal_amount
+        self.duration = 500  # Duration in milliseconds
+        self.start_time = pygame.time.get_ticks() if start_time is None else start_time
+        self.is_active = True
+    
+    def update(self, current_time=None):
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
+        if current_time - self.start_time >= self.duration:
+            self.is_active = False
+        return self.is_active
+    
+    def draw(self, screen, view=NATIVE_VIEW, current_time=None):
+        if not self.is_active:
+            return
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
+        alpha = 128 * (1 - (current_time - self.start_time) / self.duration)
+        radius = view.length(self.range)
+        surface = get_circle_overlay(radius, (0, 255, 0), alpha)
+        x, y = view.point(self.position)
+        screen.blit(surface, (x - radius, y - radius)) 
\ No newline at end of file
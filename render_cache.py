@@ -0,0 +1,145 @@
+from collections import OrderedDict
+import pygame
+
+# Shared caches for surfaces that used to be rebuilt every frame or for every
+# new entity. Everything here is keyed by value, so callers can just ask for
+# what they need each frame and get the same surface back.
+ALPHA_BUCKET = 16  # Alpha is rounded down to steps of this size
+TEXT_CACHE_SIZE = 256  # Rendered strings kept, least recently used dropped first
+NUMBER_GLYPHS = "0123456789+-$/.,:%"  # Characters a number can be composed from
+
+_fonts = {}
+_sprites = {}
+_overlays = {}
+_circles = {}
+_texts = OrderedDict()
+_glyph_atlases = {}
+_solids = {}
+_health_strips = {}
+
+def get_font(name, size, bold=False):
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+    return font
+
+def load_sprite(filename, size=(40, 40)):
+    # Failed loads are cached as None so a missing file is only reported once
+    key = (filename, size)
+    if key in _sprites:
+        return _sprites[key]
+    try:
+        sprite = pygame.transform.scale(pygame.image.load(f"assets/{filename}"), size)
+    except Exception as e:
+        print(f"Error loading sprite {filename}: {e}")
+        sprite = None
+    _sprites[key] = sprite
+    return sprite
+
+def alpha_bucket(alpha):
+    return max(0, min(255, int(alpha) // ALPHA_BUCKET * ALPHA_BUCKET))
+
+def get_overlay(size, color, alpha):
+    # Translucent filled rectangle
+    alpha = alpha_bucket(alpha)
+    key = (size, color, alpha)
+    surface = _overlays.get(key)
+    if surface is None:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill((*color, alpha))
+        _overlays[key] = surface
+    return surface
+
+def get_circle_overlay(radius, color, alpha):
+    # Translucent filled circle on a (radius * 2) square surface
+    alpha = alpha_bucket(alpha)
+    key = (radius, color, alpha)
+    surface = _circles.get(key)
+    if surface is None:
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, (*color, alpha), (radius, radius), radius)
+        _circles[key] = surface
+    return surface
+
+def get_text(font, text, color, alpha=255):
+    # Labels and other strings that rarely change. Counters that change often
+    # should go through blit_number instead so they don't churn this cache.
+    alpha = 255 if alpha >= 255 else alpha_bucket(alpha)
+    key = (font, text, color, alpha)
+    surface = _texts.get(key)
+    if surface is not None:
+        _texts.move_to_end(key)
+        return surface
+    if alpha == 255:
+        surface = font.render(text, True, color)
+    else:
+        surface = get_text(font, text, color).copy()
+        surface.set_alpha(alpha)
+    _texts[key] = surface
+    if len(_texts) > TEXT_CACHE_SIZE:
+        _texts.popitem(last=False)
+    return surface
+
+def get_glyph_atlas(font, color):
+    # Every NUMBER_GLYPHS character rendered once, side by side on one surface:
+    # returns (atlas, {char: area on the atlas})
+    key = (font, color)
+    atlas = _glyph_atlases.get(key)
+    if atlas is None:
+        glyphs = [font.render(char, True, color) for char in NUMBER_GLYPHS]
+        surface = pygame.Surface((sum(glyph.get_width() for glyph in glyphs),
+                                  max(glyph.get_height() for glyph in glyphs)), pygame.SRCALPHA)
+        # Transparent pixels take the text color so antialiased edges don't darken
+        surface.fill((*color, 0))
+        areas = {}
+        x = 0
+        for char, glyph in zip(NUMBER_GLYPHS, glyphs):
+            surface.blit(glyph, (x, 0))
+            areas[char] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+        atlas = _glyph_atlases[key] = (surface, areas)
+    return atlas
+
+def blit_number(surface, font, text, color, position):
+    # Draws a number (str or int made of NUMBER_GLYPHS) from the glyph atlas
+    # in one blits() call; returns the area drawn
+    atlas, areas = get_glyph_atlas(font, color)
+    x, y = position
+    items = []
+    for char in str(text):
+        area = areas[char]
+        items.append((atlas, (x, y), area))
+        x += area.width
+    surface.blits(items, doreturn=False)
+    return pygame.Rect(position, (x - position[0], atlas.get_height()))
+
+def blit_label(surface, font, label, value, color, position):
+    # "Cash: $" + 1234: the label from the text cache, the value from the glyph atlas
+    text = get_text(font, label, color)
+    surface.blit(text, position)
+    value_rect = blit_number(surface, font, value, color, (position[0] + text.get_width(), position[1]))
+    return value_rect.union(text.get_rect(topleft=position))
+
+def get_health_bar_strip(width, height, steps):
+    # One row per quantized health level, stacked vertically: row k is k/steps full
+    key = (width, height, steps)
+    strip = _health_strips.get(key)
+    if strip is None:
+        strip = pygame.Surface((width, height * (steps + 1)))
+        for step in range(steps + 1):
+            row = pygame.Rect(0, step * height, width, height)
+            strip.fill((255, 0, 0), row)
+            strip.fill((0, 255, 0), (0, row.y, width * step // steps, height))
+        _health_strips[key] = strip
+    return strip
+
+def get_solid(size, color):
+    # Opaque filled rectangle, used as a stand-in for missing sprites
+    key = (size, color)
+    surface = _solids.get(key)
+    if surface is None:
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        _solids[key] = surface
+    return surface
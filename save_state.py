@@ -0,0 +1,309 @@
+import os
+import queue
+import struct
+import threading
+import pygame
+from enemy import ENEMY_TYPES, SpaceRex, Enviorollante, EmperorHydra, Demolishyah
+from tower import TOWER_TYPES
+from projectile import Bullet, Maser, Missile, Beam, HealEffect
+from unit_stats import ENEMY_STATS
+from maps import MAPS
+
+# Snapshots are packed with struct rather than pickled so they never touch
+# pygame objects (surfaces, rects) and stay small and fast to write.
+# Bump SAVE_VERSION whenever a record layout or one of the kind tables changes.
+SAVE_MAGIC = b"KTDS"
+SAVE_VERSION = 4  # 2: map index after the state record, 3: maze flag, 4: lanes
+
+GAME_STATES = ("menu", "wave_prep", "playing", "game_over", "victory")
+TOWER_KINDS = tuple(TOWER_TYPES)
+ENEMY_KINDS = tuple(ENEMY_STATS)
+SPAWN_TYPES = ("rackettra", "space_rex", "enviorollante", "emperor_hydra", "demolishyah", "hydra_boss")
+PROJECTILE_KINDS = ("bullet", "maser", "missile", "beam")
+EFFECT_KINDS = ("heal",)
+MAP_KEYS = tuple(MAPS)
+
+# Frame-counted ability timers that have to survive a restore (None is stored as -1)
+ENEMY_TIMERS = {
+    SpaceRex: ("crystal_spawn_timer",),
+    Enviorollante: ("heal_timer",),
+    EmperorHydra: ("lightning_timer", "base_damage_timer"),
+    Demolishyah: ("special_timer", "base_damage_timer"),
+}
+
+HEADER = struct.Struct("<4sH")
+# wave, cash, base hp, wave delay, ms since last spawn, max towers, state, auto skip, boss alert
+STATE = struct.Struct("<iiiiiiBBB")
+# map index, maze mode
+MAP = struct.Struct("<BB")
+MAP_V2 = struct.Struct("<B")
+COUNT = struct.Struct("<I")
+# kind, x, y, ms since last shot
+TOWER = struct.Struct("<Bffi")
+# ms since the lane's last spawn (one per map lane)
+LANE = struct.Struct("<i")
+# kind, stage, wave, path index, lane, alive, x, y, hp, max hp, slow amount, slow ms, 2 timers
+ENEMY = struct.Struct("<BBHHBBfffffiii")
+ENEMY_V3 = struct.Struct("<BBHHBfffffiii")
+# kind, 8 kind-specific floats, age in ms
+PROJECTILE = struct.Struct("<B8fi")
+# kind, x, y, range, heal amount, duration, age in ms
+EFFECT = struct.Struct("<Bffffii")
+# spawn type, stage, lane
+SPAWN = struct.Struct("<BBB")
+SPAWN_V3 = struct.Struct("<BB")
+
+def snapshot(game_manager, current_time=None):
+    if current_time is None:
+        current_time = game_manager.get_ticks()
+    gm = game_manager
+    parts = [
+        HEADER.pack(SAVE_MAGIC, SAVE_VERSION),
+        STATE.pack(
+            gm.current_wave, int(gm.cash), int(gm.base_hp), int(gm.wave_delay),
+            current_time - gm.lanes[0].last_spawn_time, gm.max_towers,
+            GAME_STATES.index(gm.game_state), gm.auto_skip,
+            bool(getattr(gm, "boss_wave_notification", False))
+        ),
+        MAP.pack(MAP_KEYS.index(gm.map_name), gm.maze),
+        COUNT.pack(len(gm.lanes))
+    ]
+    for lane in gm.lanes:
+        parts.append(LANE.pack(current_time - lane.last_spawn_time))
+
+    parts.append(COUNT.pack(len(gm.towers)))
+    for tower in gm.towers:
+        parts.append(TOWER.pack(
+            TOWER_KINDS.index(tower.kind), tower.position.x, tower.position.y,
+            current_time - tower.last_shot
+        ))
+
+    parts.append(COUNT.pack(len(gm.enemies)))
+    for enemy in gm.enemies:
+        slow = enemy.effects.get("slow")
+        timers = [getattr(enemy, name) for name in ENEMY_TIMERS.get(type(enemy), ())]
+        timers += [None] * (2 - len(timers))
+        parts.append(ENEMY.pack(
+            ENEMY_KINDS.index(enemy.kind), getattr(enemy, "stage", 0), enemy.wave_number,
+            enemy.current_path_index, enemy.lane, enemy.is_alive,
+            enemy.position.x, enemy.position.y, enemy.hp, enemy.max_hp,
+            slow["amount"] if slow else 0.0, int(slow["duration"]) if slow else 0,
+            -1 if timers[0] is None else timers[0], -1 if timers[1] is None else timers[1]
+        ))
+
+    parts.append(COUNT.pack(len(gm.projectiles)))
+    for projectile in gm.projectiles:
+        if projectile.kind == "beam":
+            values = (projectile.start.x, projectile.start.y, projectile.end.x, projectile.end.y,
+                      projectile.damage, projectile.width, projectile.duration, 0.0)
+            age = current_time - projectile.start_time
+        else:
+            extra = (0.0, 0.0)
+            if projectile.kind == "missile":
+                extra = (projectile.aoe_radius, 0.0)
+            elif projectile.kind == "maser":
+                extra = (projectile.effect["amount"], projectile.effect["duration"])
+            values = (projectile.position.x, projectile.position.y,
+                      projectile.target.x, projectile.target.y,
+                      projectile.damage, projectile.speed) + extra
+            age = 0
+        parts.append(PROJECTILE.pack(PROJECTILE_KINDS.index(projectile.kind), *values, age))
+
+    parts.append(COUNT.pack(len(gm.effects)))
+    for effect in gm.effects:
+        parts.append(EFFECT.pack(
+            EFFECT_KINDS.index(effect.kind), effect.position.x, effect.position.y,
+            effect.range, effect.heal_amount, effect.duration, current_time - effect.start_time
+        ))
+
+    spawns = [(enemy_type, stage, lane.index) for lane in gm.lanes for enemy_type, stage in lane.spawn_queue]
+    parts.append(COUNT.pack(len(spawns)))
+    for enemy_type, stage, lane in spawns:
+        parts.append(SPAWN.pack(SPAWN_TYPES.index(enemy_type), stage or 0, lane))
+
+    return b"".join(parts)
+
+def _build_enemy(kind, stage, path, wave_number):
+    if kind == "hydra_boss":
+        return EmperorHydra(path, is_boss=True, wave_number=wave_number)
+    if stage:
+        return Demolishyah(path, stage, wave_number=wave_number)
+    return ENEMY_TYPES[kind](path, wave_number=wave_number)
+
+def restore(game_manager, data, current_time=None):
+    if current_time is None:
+        current_time = game_manager.get_ticks()
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != SAVE_MAGIC:
+        raise ValueError("Not a KTD save file")
+    if version not in (1, 2, 3, SAVE_VERSION):
+        raise ValueError(f"Unsupported save version {version} (expected {SAVE_VERSION})")
+    offset = HEADER.size
+
+    gm = game_manager
+    (gm.current_wave, gm.cash, gm.base_hp, gm.wave_delay, spawn_age, gm.max_towers,
+     state, auto_skip, boss_alert) = STATE.unpack_from(data, offset)
+    offset += STATE.size
+    gm.game_state = GAME_STATES[state]
+    gm.auto_skip = bool(auto_skip)
+    gm.boss_wave_notification = bool(boss_alert)
+    if version >= 3:
+        map_index, maze = MAP.unpack_from(data, offset)
+        offset += MAP.size
+    elif version == 2:
+        map_index, = MAP_V2.unpack_from(data, offset)
+        offset += MAP_V2.size
+        maze = False
+    else:
+        map_index, maze = MAP_KEYS.index("city"), False  # Version 1 saves predate maps
+    gm.maze = bool(maze)
+    gm.set_map(MAP_KEYS[map_index])
+
+    def records(record):
+        nonlocal offset
+        count, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        for _ in range(count):
+            yield record.unpack_from(data, offset)
+            offset += record.size
+
+    if version >= 4:
+        for lane, (lane_spawn_age,) in zip(gm.lanes, list(records(LANE))):
+            lane.last_spawn_time = current_time - lane_spawn_age
+    else:
+        gm.lanes[0].last_spawn_time = current_time - spawn_age  # Older saves have a single lane
+
+    gm.towers = []
+    for kind, x, y, shot_age in records(TOWER):
+        tower = TOWER_TYPES[TOWER_KINDS[kind]](x, y)
+        tower.last_shot = current_time - shot_age
+        gm.towers.append(tower)
+
+    gm.enemies = []
+    for values in records(ENEMY if version >= 4 else ENEMY_V3):
+        if version < 4:
+            values = values[:4] + (0,) + values[4:]
+        (kind, stage, wave_number, path_index, lane, alive, x, y, hp, max_hp,
+         slow_amount, slow_duration, timer_a, timer_b) = values
+        path = gm.lanes[lane].path
+        enemy = _build_enemy(ENEMY_KINDS[kind], stage, path, wave_number)
+        enemy.lane = lane
+        enemy.current_path_index = path_index
+        enemy.target = pygame.math.Vector2(path[min(path_index + 1, len(path) - 1)])
+        enemy.position = pygame.math.Vector2(x, y)
+        enemy.rect.center = enemy.position
+        enemy.is_alive = bool(alive)
+        enemy.hp = hp
+        enemy.max_hp = max_hp
+        if slow_duration:
+            enemy.effects["slow"] = {"amount": slow_amount, "duration": slow_duration}
+        for name, value in zip(ENEMY_TIMERS.get(type(enemy), ()), (timer_a, timer_b)):
+            setattr(enemy, name, None if value < 0 else value)
+        gm.enemies.append(enemy)
+
+    gm.projectiles = []
+    for kind, a, b, c, d, damage, speed, extra_a, extra_b, age in records(PROJECTILE):
+        kind = PROJECTILE_KINDS[kind]
+        if kind == "beam":
+            # For beams the speed and extra fields hold width and duration
+            projectile = Beam((a, b), (c, d), damage, int(speed))
+            projectile.duration = int(extra_a)
+            projectile.start_time = current_time - age
+        elif kind == "missile":
+            projectile = Missile((a, b), (c, d), damage, extra_a)
+        elif kind == "maser":
+            projectile = Maser((a, b), (c, d), damage,
+                               {"type": "slow", "amount": extra_a, "duration": int(extra_b)})
+        else:
+            projectile = Bullet((a, b), (c, d), damage)
+        if kind != "beam":
+            projectile.speed = speed
+        gm.projectiles.append(projectile)
+
+    gm.effects = []
+    for kind, x, y, effect_range, heal_amount, duration, age in records(EFFECT):
+        effect = HealEffect((x, y), int(effect_range), heal_amount)
+        effect.duration = duration
+        effect.start_time = current_time - age
+        gm.effects.append(effect)
+
+    for values in records(SPAWN if version >= 4 else SPAWN_V3):
+        enemy_type, stage, lane = values if version >= 4 else values + (0,)
+        gm.lanes[lane].spawn_queue.append((SPAWN_TYPES[enemy_type], stage or None))
+    gm.tower_scheduler.rebuild(gm.towers, gm.enemies)
+    gm.tower_grid.rebuild(gm.towers)
+    if gm.flow_field:
+        gm.flow_field.rebuild([tower.position for tower in gm.towers])
+    gm.rebuild_lanes()
+    if gm.telemetry:
+        gm.telemetry.reset(gm.towers)
+    return gm
+
+def write_snapshot_file(path, data):
+    # Write to a temporary file first so a crash mid-write never corrupts the last save
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def save_game(game_manager, path):
+    write_snapshot_file(path, snapshot(game_manager))
+
+def load_game(game_manager, path):
+    with open(path, "rb") as f:
+        return restore(game_manager, f.read())
+
+class AutoSaver:
+    def __init__(self, path, interval_ms=15000):
+        self.path = path
+        self.interval_ms = interval_ms
+        self.last_save_time = 0
+        # Holds at most one pending job; a newer snapshot replaces one the writer hasn't reached
+        self.pending = queue.Queue(maxsize=1)
+        self.thread = threading.Thread(target=self._writer, name="autosave", daemon=True)
+        self.thread.start()
+
+    def update(self, game_manager, current_time):
+        # Called once per frame; only the snapshot itself runs on the game thread
+        if game_manager.game_state not in ("wave_prep", "playing"):
+            return
+        if current_time - self.last_save_time >= self.interval_ms:
+            self.save_now(game_manager, current_time)
+
+    def save_now(self, game_manager, current_time):
+        self.last_save_time = current_time
+        self._submit(("save", snapshot(game_manager, current_time)))
+
+    def clear(self):
+        # Finished runs shouldn't be resumed
+        self._submit(("delete", None))
+
+    def close(self):
+        self.pending.put(None)
+        self.thread.join(timeout=2)
+
+    def _submit(self, job):
+        try:
+            self.pending.put_nowait(job)
+        except queue.Full:
+            try:
+                self.pending.get_nowait()
+            except queue.Empty:
+                pass
+            self.pending.put_nowait(job)
+
+    def _writer(self):
+        while True:
+            job = self.pending.get()
+            if job is None:
+                return
+            action, data = job
+            try:
+                if action == "save":
+                    write_snapshot_file(self.path, data)
+                elif os.path.exists(self.path):
+                    os.remove(self.path)
+            except OSError as e:
+                print(f"Error writing autosave: {e}")
@@ -0,0 +1,116 @@
+import os
+import pickle
+import sys
+from multiprocessing.connection import wait
+from frame_pacer import GameClock
+from game_manager import GameManager
+from maps import DEFAULT_MAP
+from save_state import snapshot, restore
+
+# Runs the game logic without a window, on a simulated clock, as fast as the
+# CPU allows. Used by the optimizer and other offline tools. Steps are the
+# same fixed 60 Hz ticks the game window runs on.
+FORK_READ_SIZE = 65536
+
+class HeadlessSimulation:
+    def __init__(self, seed=None, cash=None, map_name=DEFAULT_MAP, maze=False):
+        self.clock = GameClock()
+        self.game_manager = GameManager(seed, map_name=map_name, maze=maze)
+        self.game_manager.get_ticks = self.clock.get_ticks
+        self.game_manager.game_state = "wave_prep"
+        if cash is not None:
+            self.game_manager.cash = cash
+
+    @property
+    def time(self):
+        return self.clock.get_ticks()
+
+    def step(self):
+        self.clock.advance()
+        gm = self.game_manager
+        gm.update()
+        gm.update_combat(self.time)
+
+    def run_wave(self, max_frames=100000):
+        # Plays the next wave to completion; returns the resulting game state
+        gm = self.game_manager
+        if not gm.start_wave():
+            return gm.game_state
+        for _ in range(max_frames):
+            self.step()
+            if gm.game_state != "playing":
+                break
+        return gm.game_state
+
+    def buy_tower(self, tower_class, position):
+        return self.game_manager.buy_tower(tower_class, position)
+
+    def checkpoint(self):
+        # Compact copy of the whole run (binary snapshot plus clock and RNG state)
+        return pickle.dumps((snapshot(self.game_manager, self.time), self.clock.time,
+                             self.game_manager.rng.getstate()))
+
+    @classmethod
+    def from_checkpoint(cls, data):
+        state, time, rng_state = pickle.loads(data)
+        simulation = cls()
+        simulation.clock.time = time
+        restore(simulation.game_manager, state, simulation.time)
+        simulation.game_manager.rng.setstate(rng_state)
+        return simulation
+
+    def fork(self):
+        # Independent in-process copy
+        return HeadlessSimulation.from_checkpoint(self.checkpoint())
+
+def fork_map(simulation, function, items, workers=None):
+    # Returns [function(copy, item) for item in items], with each call getting
+    # its own copy of simulation. Where os.fork exists every call runs in a
+    # forked child that inherits the simulation copy-on-write: nothing is
+    # serialized on the way in and the parent's copy is never touched.
+    # Results come back pickled through a pipe; a call that raises gives None.
+    if not hasattr(os, "fork"):
+        return [function(simulation.fork(), item) for item in items]
+
+    workers = workers or os.cpu_count() or 1
+    sys.stdout.flush()  # Children would otherwise print the parent's buffered output again
+    results = [None] * len(items)
+    running = {}  # Pipe read end -> (pid, item index, chunks read so far)
+    pending = iter(enumerate(items))
+    while True:
+        for index, item in pending:
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                # The child must never return into the parent's loop
+                try:
+                    os.close(read_fd)
+                    try:
+                        payload = pickle.dumps(function(simulation, item))
+                    except Exception as e:
+                        print(f"Error evaluating {item!r}: {e}")
+                        payload = pickle.dumps(None)
+                    with os.fdopen(write_fd, "wb") as f:
+                        f.write(payload)
+                    sys.stdout.flush()
+                finally:
+                    os._exit(0)
+            os.close(write_fd)
+            running[read_fd] = (pid, index, [])
+            if len(running) >= workers:
+                break
+        if not running:
+            return results
+
+        for read_fd in wait(list(running)):
+            pid, index, chunks = running[read_fd]
+            chunk = os.read(read_fd, FORK_READ_SIZE)
+            if chunk:
+                chunks.append(chunk)
+                continue
+            # End of pipe: the child is done
+            os.close(read_fd)
+            os.waitpid(pid, 0)
+            del running[read_fd]
+            if chunks:
+                results[index] = pickle.loads(b"".join(chunks))
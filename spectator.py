@@ -0,0 +1,345 @@
+import asyncio
+import struct
+import threading
+import pygame
+from save_state import GAME_STATES, TOWER_KINDS, ENEMY_KINDS, PROJECTILE_KINDS, MAP_KEYS, _build_enemy
+from tower import TOWER_TYPES
+from projectile import Bullet, Maser, Missile, Beam, HealEffect
+from particles import ParticleSystem
+from maps import MAPS
+
+# Live game state for spectator screens. The game thread only takes a small
+# capture of the state a few times a second and hands it to an asyncio loop
+# on its own thread; that loop delta-encodes it for every connected viewer
+# (against what that viewer last received) and writes it out. A slow viewer
+# just skips frames, so the game never waits on a socket.
+#
+# Every message is a MESSAGE header (length of the rest, type) and a body.
+# A frame body is the STATE record followed by counted sections of towers
+# removed/added, enemies removed/added/moved, all projectiles, all effects
+# and the events since the last frame the viewer got.
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 8765
+DEFAULT_RATE = 15  # Frames per second sent to viewers
+MAX_PENDING_EVENTS = 256  # Per viewer; older events are dropped if a viewer falls behind
+EVENT_KINDS = ("death", "damage_base")  # Enemy killed, enemy reached the base (particle burst names)
+
+MESSAGE = struct.Struct("<IB")  # length of type + body, message type
+HELLO, FRAME = 0, 1
+VERSION = struct.Struct("<H")
+# time in ms, wave, max waves, cash, base hp, max towers, state, boss alert, map index, maze mode
+STATE = struct.Struct("<iiiiiiBBBB")
+COUNT = struct.Struct("<H")
+ENTITY_ID = struct.Struct("<I")
+# id, kind, x, y
+TOWER = struct.Struct("<IBff")
+# id, kind, stage, lane, x, y, hp, max hp
+ENEMY = struct.Struct("<IBBBffff")
+# id, x, y, hp
+ENEMY_MOVE = struct.Struct("<Ifff")
+# kind, beam width, position (beam start), target (beam end)
+PROJECTILE = struct.Struct("<BBffff")
+# x, y, range, age in ms
+EFFECT = struct.Struct("<fffH")
+# kind, x, y
+EVENT = struct.Struct("<Bff")
+
+class Capture:
+    # Plain tuples of everything a viewer draws, taken on the game thread
+    __slots__ = ("state", "towers", "enemies", "projectiles", "effects", "events")
+
+class Viewer:
+    __slots__ = ("writer", "task", "ready", "towers", "enemies", "events")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.task = asyncio.current_task()  # The connection's handler, cancelled on close()
+        self.ready = asyncio.Event()  # A frame newer than the last one sent is waiting
+        self.towers = {}  # id -> record this viewer already has
+        self.enemies = {}
+        self.events = []  # Not yet sent
+
+class SpectatorServer:
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, rate=DEFAULT_RATE):
+        self.host = host
+        self.port = port  # 0 picks a free port; the real one is set once listening
+        self.interval = 1000 / rate
+        self.last_publish = None
+        self.viewers = set()
+        self.latest = None
+        # Game-thread side: stable ids for the entities seen in the last capture
+        self.next_id = 1
+        self.tower_ids = {}
+        self.enemy_ids = {}
+        self.loop = None
+        self.thread = None
+        self.listening = threading.Event()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="spectator-server", daemon=True)
+        self.thread.start()
+        self.listening.wait()
+        return self.loop is not None
+
+    def close(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.stopped.set)
+            self.thread.join()
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except OSError as e:
+            print(f"Error starting spectator server: {e}")
+            self.loop = None
+        finally:
+            self.listening.set()
+
+    async def _serve(self):
+        self.stopped = asyncio.Event()
+        server = await asyncio.start_server(self._handle_viewer, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self.loop = asyncio.get_running_loop()
+        print(f"Spectator server listening on {self.host}:{self.port}")
+        self.listening.set()
+        async with server:
+            await self.stopped.wait()
+            # End the viewer handlers first (each closes its own connection);
+            # closing the server waits for open connections
+            tasks = [viewer.task for viewer in self.viewers]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Game thread
+
+    def publish(self, game_manager, current_time):
+        # Called every tick; captures at most `rate` times a second and only while someone watches
+        if not self.viewers or not self.loop:
+            # Nobody watching: forget the ids, so the next viewer isn't sent
+            # events for enemies it never saw
+            if self.tower_ids or self.enemy_ids:
+                self.tower_ids, self.enemy_ids = {}, {}
+                self.last_publish = None
+            return
+        if self.last_publish is not None and current_time - self.last_publish < self.interval:
+            return
+        self.last_publish = current_time
+        capture = self.capture(game_manager, current_time)
+        self.loop.call_soon_threadsafe(self._frame_ready, capture)
+
+    def _ids(self, entities, previous):
+        ids = {}
+        for entity in entities:
+            entity_id = previous.get(entity)
+            if entity_id is None:
+                entity_id = self.next_id
+                self.next_id += 1
+            ids[entity] = entity_id
+        return ids
+
+    def capture(self, game_manager, current_time):
+        gm = game_manager
+        capture = Capture()
+        capture.state = (current_time, gm.current_wave, gm.max_waves, int(gm.cash), int(gm.base_hp),
+                         gm.max_towers, GAME_STATES.index(gm.game_state),
+                         bool(getattr(gm, "boss_wave_notification", False)),
+                         MAP_KEYS.index(gm.map_name), gm.maze)
+
+        tower_ids = self._ids(gm.towers, self.tower_ids)
+        capture.towers = {tower_id: (TOWER_KINDS.index(tower.kind), tower.position.x, tower.position.y)
+                          for tower, tower_id in tower_ids.items()}
+        enemy_ids = self._ids(gm.enemies, self.enemy_ids)
+        capture.enemies = {
+            enemy_id: (ENEMY_KINDS.index(enemy.kind), getattr(enemy, "stage", 0), enemy.lane,
+                       enemy.position.x, enemy.position.y, enemy.hp, enemy.max_hp)
+            for enemy, enemy_id in enemy_ids.items()
+        }
+        # Enemies gone since the last capture were either killed or reached the base
+        capture.events = [(EVENT_KINDS.index("damage_base" if enemy.is_alive else "death"),
+                           enemy.position.x, enemy.position.y)
+                          for enemy in self.enemy_ids.keys() - enemy_ids.keys()]
+        self.tower_ids, self.enemy_ids = tower_ids, enemy_ids
+
+        capture.projectiles = []
+        for projectile in gm.projectiles:
+            if projectile.kind == "beam":
+                start, end, width = projectile.start, projectile.end, int(projectile.width)
+            else:
+                start, end, width = projectile.position, projectile.target, 0
+            capture.projectiles.append((PROJECTILE_KINDS.index(projectile.kind), width,
+                                        start.x, start.y, end.x, end.y))
+        capture.effects = [(effect.position.x, effect.position.y, effect.range,
+                            min(max(current_time - effect.start_time, 0), 0xFFFF))
+                           for effect in gm.effects]
+        return capture
+
+    # Server thread
+
+    def _frame_ready(self, capture):
+        self.latest = capture
+        for viewer in self.viewers:
+            viewer.events.extend(capture.events)
+            del viewer.events[:-MAX_PENDING_EVENTS]
+            viewer.ready.set()
+
+    async def _handle_viewer(self, reader, writer):
+        viewer = Viewer(writer)
+        self.viewers.add(viewer)
+        try:
+            writer.write(message(HELLO, VERSION.pack(PROTOCOL_VERSION)))
+            while True:
+                await viewer.ready.wait()
+                viewer.ready.clear()
+                writer.write(message(FRAME, encode_frame(viewer, self.latest)))
+                await writer.drain()  # Only this viewer waits; frames that arrive meanwhile are skipped
+        except ConnectionError:
+            pass  # Viewer went away
+        except asyncio.CancelledError:
+            pass  # Server closing; ending normally keeps asyncio from reporting the cancel
+        finally:
+            self.viewers.discard(viewer)
+            writer.close()
+
+def message(message_type, body):
+    return MESSAGE.pack(len(body) + 1, message_type) + body
+
+def encode_frame(viewer, capture):
+    # Delta against what this viewer already has; updates viewer's copy to match
+    parts = [STATE.pack(*capture.state)]
+
+    removed = viewer.towers.keys() - capture.towers.keys()
+    added = capture.towers.keys() - viewer.towers.keys()
+    parts.append(COUNT.pack(len(removed)))
+    parts.extend(ENTITY_ID.pack(tower_id) for tower_id in removed)
+    parts.append(COUNT.pack(len(added)))
+    parts.extend(TOWER.pack(tower_id, *capture.towers[tower_id]) for tower_id in added)
+    viewer.towers = capture.towers
+
+    removed = viewer.enemies.keys() - capture.enemies.keys()
+    added, moved = [], []
+    for enemy_id, record in capture.enemies.items():
+        known = viewer.enemies.get(enemy_id)
+        if known is None:
+            added.append(ENEMY.pack(enemy_id, *record))
+        elif known[3:6] != record[3:6]:
+            moved.append(ENEMY_MOVE.pack(enemy_id, *record[3:6]))
+    parts.append(COUNT.pack(len(removed)))
+    parts.extend(ENTITY_ID.pack(enemy_id) for enemy_id in removed)
+    for records in (added, moved):
+        parts.append(COUNT.pack(len(records)))
+        parts.extend(records)
+    viewer.enemies = capture.enemies
+
+    for record, values in ((PROJECTILE, capture.projectiles), (EFFECT, capture.effects),
+                           (EVENT, viewer.events)):
+        parts.append(COUNT.pack(len(values)))
+        parts.extend(record.pack(*value) for value in values)
+    viewer.events = []
+    return b"".join(parts)
+
+def read_messages(buffer):
+    # Splits complete messages off the front of a bytearray: yields (type, body)
+    while len(buffer) >= MESSAGE.size:
+        length, message_type = MESSAGE.unpack_from(buffer, 0)
+        end = MESSAGE.size - 1 + length
+        if len(buffer) < end:
+            return
+        body = bytes(buffer[MESSAGE.size:end])
+        del buffer[:end]
+        yield message_type, body
+
+class SpectatorMirror:
+    # The game as a viewer sees it, rebuilt from frames. Has the attributes
+    # Game.draw() reads from a FrameSnapshot, so it can be drawn the same way.
+    def __init__(self):
+        self.game_state = "menu"
+        self.cash = self.current_wave = self.max_waves = self.base_hp = self.max_towers = 0
+        self.boss_wave_notification = False
+        self.map_name = None
+        self.maze = False
+        self.world_size = (0, 0)
+        self.paths = []
+        self.tower_by_id = {}
+        self.enemy_by_id = {}
+        self.towers = []
+        self.enemies = []
+        self.projectiles = []
+        self.effects = []
+        self.particles = ParticleSystem()
+        self.preview = None
+        self.time = 0  # Wall clock the effects are drawn at (set by the viewer)
+
+    def apply(self, message_type, body):
+        if message_type == HELLO:
+            version, = VERSION.unpack(body)
+            if version != PROTOCOL_VERSION:
+                raise ValueError(f"Unsupported spectator protocol {version} (expected {PROTOCOL_VERSION})")
+        elif message_type == FRAME:
+            self.apply_frame(body)
+
+    def apply_frame(self, body):
+        offset = 0
+
+        def records(record):
+            nonlocal offset
+            count, = COUNT.unpack_from(body, offset)
+            offset += COUNT.size
+            for _ in range(count):
+                yield record.unpack_from(body, offset)
+                offset += record.size
+
+        (_, self.current_wave, self.max_waves, self.cash, self.base_hp, self.max_towers,
+         state, boss_alert, map_index, maze) = STATE.unpack_from(body, offset)
+        offset += STATE.size
+        self.game_state = GAME_STATES[state]
+        self.boss_wave_notification = bool(boss_alert)
+        if MAP_KEYS[map_index] != self.map_name or bool(maze) != self.maze:
+            self.map_name, self.maze = MAP_KEYS[map_index], bool(maze)
+            definition = MAPS[self.map_name]
+            self.world_size = (definition.width, definition.height)
+            self.paths = definition.lanes
+        now = pygame.time.get_ticks()
+
+        for tower_id, in records(ENTITY_ID):
+            self.tower_by_id.pop(tower_id, None)
+        for tower_id, kind, x, y in records(TOWER):
+            self.tower_by_id[tower_id] = TOWER_TYPES[TOWER_KINDS[kind]](x, y)
+
+        for enemy_id, in records(ENTITY_ID):
+            self.enemy_by_id.pop(enemy_id, None)
+        for enemy_id, kind, stage, lane, x, y, hp, max_hp in records(ENEMY):
+            enemy = _build_enemy(ENEMY_KINDS[kind], stage, self.paths[lane], self.current_wave)
+            enemy.lane = lane
+            enemy.max_hp = max_hp
+            self.enemy_by_id[enemy_id] = enemy
+            self._move(enemy, x, y, hp)
+        for enemy_id, x, y, hp in records(ENEMY_MOVE):
+            enemy = self.enemy_by_id.get(enemy_id)
+            if enemy:
+                self._move(enemy, x, y, hp)
+        self.towers = list(self.tower_by_id.values())
+        self.enemies = list(self.enemy_by_id.values())
+
+        self.projectiles = []
+        for kind, width, a, b, c, d in records(PROJECTILE):
+            kind = PROJECTILE_KINDS[kind]
+            if kind == "beam":
+                projectile = Beam((a, b), (c, d), 0, width, start_time=now)
+            elif kind == "missile":
+                projectile = Missile((a, b), (c, d), 0, 0)
+            elif kind == "maser":
+                projectile = Maser((a, b), (c, d), 0, None)
+            else:
+                projectile = Bullet((a, b), (c, d), 0)
+            self.projectiles.append(projectile)
+        self.effects = [HealEffect((x, y), int(effect_range), 0, start_time=now - age)
+                        for x, y, effect_range, age in records(EFFECT)]
+
+        for kind, x, y in records(EVENT):
+            self.particles.emit(EVENT_KINDS[kind], (x, y))
+
+    def _move(self, enemy, x, y, hp):
+        enemy.position = pygame.math.Vector2(x, y)
+        enemy.rect.center = enemy.position
+        enemy.hp = hp
@@ -0,0 +1,81 @@
+import argparse
+import socket
+import sys
+import pygame
+from main import Game, FPS
+from spectator import SpectatorMirror, read_messages, DEFAULT_PORT
+
+# Watches a game started with `main.py --spectate` and draws it with the
+# game's own renderer. Input only moves this screen's camera (arrow keys/WASD,
+# mouse wheel); the game itself can't be touched from here.
+RECEIVE_SIZE = 1 << 16
+
+class SpectatorViewer:
+    def __init__(self, host, port):
+        self.socket = socket.create_connection((host, port))
+        self.socket.setblocking(False)
+        self.buffer = bytearray()
+        self.mirror = SpectatorMirror()
+        self.game = None  # Created once the first frame says which map is on
+        self.running = True
+
+    def receive(self):
+        # Applies every complete message that has arrived; never waits
+        while True:
+            try:
+                data = self.socket.recv(RECEIVE_SIZE)
+            except BlockingIOError:
+                break
+            except ConnectionError:
+                data = b""
+            if not data:
+                print("Game closed the connection")
+                self.running = False
+                break
+            self.buffer += data
+        for message_type, body in read_messages(self.buffer):
+            self.mirror.apply(message_type, body)
+
+    def run(self):
+        clock = pygame.time.Clock()  # Until the game window exists
+        while self.running:
+            self.receive()
+            mirror = self.mirror
+            if mirror.map_name and (self.game is None or self.game.game_manager.map_name != mirror.map_name
+                                    or self.game.game_manager.maze != mirror.maze):
+                self.game = Game(map_name=mirror.map_name, maze=mirror.maze)
+                pygame.display.set_caption("Kaiju Tower Defense - Spectator")
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                elif event.type == pygame.MOUSEWHEEL and self.game:
+                    self.game.camera.zoom_at(pygame.mouse.get_pos(), event.y)
+            if self.game:
+                mirror.time = pygame.time.get_ticks()
+                mirror.particles.update(mirror.time)
+                self.game.update_camera()
+                self.game.draw(mirror)
+                self.game.pacer.wait()  # Its frame time drives camera panning
+            else:
+                clock.tick(FPS)
+        self.socket.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a Kaiju Tower Defense game streamed with --spectate")
+    parser.add_argument("--host", default="127.0.0.1", help="machine running the game (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"spectator port (default: {DEFAULT_PORT})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        viewer = SpectatorViewer(args.host, args.port)
+    except OSError as e:
+        print(f"Could not connect to {args.host}:{args.port}: {e}")
+        return 1
+    viewer.run()
+    pygame.quit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+import time
+
+# Time from launch to the first frame on screen, split into stages. main.py
+# imports this before anything else, so the clock starts ahead of pygame and
+# the game modules, and marks each stage as it finishes.
+STARTED = time.perf_counter()
+
+class StartupProfile:
+    def __init__(self, start=STARTED):
+        self.start = start
+        self.last = start
+        self.stages = []  # (name, ms) in order
+
+    def mark(self, name):
+        # Ends the current stage
+        now = time.perf_counter()
+        self.stages.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def total_ms(self):
+        return (self.last - self.start) * 1000
+
+    def report(self):
+        total = self.total_ms()
+        print(f"Time to first frame: {total:.1f} ms")
+        for name, ms in self.stages:
+            print(f"  {name:<22}{ms:8.1f} ms {ms / total:6.1%}")
+
+STARTUP = StartupProfile()
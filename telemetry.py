@@ -0,0 +1,106 @@
+import json
+import time
+from array import array
+
+# Per-tower combat counters for the current wave, written to a JSON-lines log
+# when the wave ends (one line per tower per wave). Each counter is a flat
+# preallocated array indexed by the tower's telemetry slot, so recording an
+# event is a couple of array adds and costs nothing measurable per frame.
+#  - shots: projectiles, beams and heal pulses fired (every missile of a salvo counts)
+#  - hits: direct impacts; each frame a beam touches an enemy counts as one
+#  - damage: HP actually removed, including missile splash and beam ticks
+#  - overkill: damage beyond what the target had left, or dealt to an already dead target
+#  - kills: killing blows
+#  - slow_ms: slow duration put on enemies that aren't immune to it (masers)
+INITIAL_SLOTS = 64
+COUNTERS = ("shots", "hits", "damage", "overkill", "kills", "slow_ms")
+
+class CombatTelemetry:
+    def __init__(self, path, slots=INITIAL_SLOTS):
+        self.path = path
+        self.shots = array("q", bytes(8 * slots))
+        self.hits = array("q", bytes(8 * slots))
+        self.damage = array("d", bytes(8 * slots))
+        self.overkill = array("d", bytes(8 * slots))
+        self.kills = array("q", bytes(8 * slots))
+        self.slow_ms = array("q", bytes(8 * slots))
+        self.towers = {}  # Slot -> tower, including towers sold during the current wave
+        self.sold = set()  # Slots freed once the current wave has been written
+        self.free_slots = list(range(slots - 1, -1, -1))
+
+    def _grow(self):
+        # Only reached with more towers than preallocated slots (never with the default limit)
+        slots = len(self.shots)
+        for name in COUNTERS:
+            getattr(self, name).extend(array(getattr(self, name).typecode, bytes(8 * slots)))
+        self.free_slots.extend(range(2 * slots - 1, slots - 1, -1))
+
+    def add_tower(self, tower):
+        if not self.free_slots:
+            self._grow()
+        slot = self.free_slots.pop()
+        tower.telemetry_slot = slot
+        self.towers[slot] = tower
+
+    def remove_tower(self, tower):
+        # Keep the slot until the wave is written so the sold tower's numbers aren't lost
+        self.sold.add(tower.telemetry_slot)
+
+    def reset(self, towers):
+        # Used after the tower list is replaced wholesale (e.g. loading a save)
+        self.__init__(self.path, len(self.shots))
+        for tower in towers:
+            self.add_tower(tower)
+
+    def record_shot(self, slot, count=1):
+        self.shots[slot] += count
+
+    def record_damage(self, slot, amount, hp_before, killed, direct=True):
+        # hp_before is the target's HP before the hit, or 0 if it was already dead
+        dealt = amount if amount < hp_before else max(hp_before, 0)
+        self.damage[slot] += dealt
+        self.overkill[slot] += amount - dealt
+        if killed:
+            self.kills[slot] += 1
+        if direct:
+            self.hits[slot] += 1
+
+    def record_slow(self, slot, duration_ms):
+        self.slow_ms[slot] += duration_ms
+
+    def flush(self, wave, outcome):
+        # Called once when a wave ends: write every tower's counters, then zero them
+        timestamp = round(time.time(), 3)
+        lines = []
+        for slot, tower in self.towers.items():
+            lines.append(json.dumps({
+                "time": timestamp,
+                "wave": wave,
+                "outcome": outcome,
+                "tower": slot,
+                "kind": tower.kind,
+                "x": tower.position.x,
+                "y": tower.position.y,
+                "cost": tower.cost,
+                "sold": slot in self.sold,
+                "shots": self.shots[slot],
+                "hits": self.hits[slot],
+                "damage": round(self.damage[slot], 1),
+                "overkill": round(self.overkill[slot], 1),
+                "kills": self.kills[slot],
+                "slow_seconds": self.slow_ms[slot] / 1000,
+            }))
+            for name in COUNTERS:
+                getattr(self, name)[slot] = 0
+        for slot in self.sold:
+            del self.towers[slot]
+            self.free_slots.append(slot)
+        self.sold.clear()
+
+        if not lines:
+            return
+        try:
+            with open(self.path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"Error writing telemetry: {e}")
@@ -0,0 +1,115 @@
+import heapq
+
+# Keeps towers out of the per-frame targeting loop unless they could actually fire.
+#  - Cooling towers wait in a heap keyed by the time they can next shoot.
+#  - Ready towers are checked every frame while an enemy is near them.
+#  - A ready tower with no enemy anywhere near it is parked on the grid cells
+#    its range covers, and is woken when an enemy moves into one of them.
+CELL_SIZE = 80
+
+def cell_of(position):
+    return (int(position[0]) // CELL_SIZE, int(position[1]) // CELL_SIZE)
+
+class TowerScheduler:
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.cooling = []  # Heap of (ready_time, sequence, tower)
+        self.sequence = 0  # Tie-breaker so the heap never compares towers
+        self.ready = {}  # Ready towers in placement order (dict used as an ordered set)
+        self.parked = {}  # Cell -> set of parked towers watching it
+        self.tower_cells = {}  # Tower -> cells covered by its range (only towers still placed)
+        self.occupancy = {}  # Cell -> number of enemies in it
+
+    def add_tower(self, tower):
+        x, y = tower.position
+        reach = tower.range
+        min_x, min_y = cell_of((x - reach, y - reach))
+        max_x, max_y = cell_of((x + reach, y + reach))
+        self.tower_cells[tower] = [(cx, cy) for cx in range(min_x, max_x + 1)
+                                   for cy in range(min_y, max_y + 1)]
+        self.cool(tower)
+
+    def remove_tower(self, tower):
+        # Stale heap entries are skipped when they come due
+        self._unpark(tower)
+        self.ready.pop(tower, None)
+        self.tower_cells.pop(tower, None)
+
+    def cool(self, tower):
+        # Tower just fired (or was just placed): wait out its cooldown
+        self.ready.pop(tower, None)
+        self.sequence += 1
+        heapq.heappush(self.cooling, (tower.last_shot + tower.cooldown_ms, self.sequence, tower))
+
+    def ready_towers(self, current_time):
+        cooling = self.cooling
+        while cooling and cooling[0][0] <= current_time:
+            tower = heapq.heappop(cooling)[2]
+            if tower in self.tower_cells:
+                self.ready[tower] = None
+        return list(self.ready)
+
+    def park(self, tower):
+        # Ready tower found no target. Keep trying every frame while any enemy
+        # is nearby, otherwise sleep until one enters a covered cell.
+        cells = self.tower_cells[tower]
+        occupancy = self.occupancy
+        for cell in cells:
+            if occupancy.get(cell):
+                return
+        del self.ready[tower]
+        parked = self.parked
+        for cell in cells:
+            watchers = parked.get(cell)
+            if watchers is None:
+                watchers = parked[cell] = set()
+            watchers.add(tower)
+
+    def _unpark(self, tower):
+        for cell in self.tower_cells.get(tower, ()):
+            watchers = self.parked.get(cell)
+            if watchers:
+                watchers.discard(tower)
+                if not watchers:
+                    del self.parked[cell]
+
+    def _enter_cell(self, cell):
+        count = self.occupancy.get(cell, 0)
+        self.occupancy[cell] = count + 1
+        if count == 0 and cell in self.parked:
+            for tower in list(self.parked[cell]):
+                self._unpark(tower)
+                self.ready[tower] = None
+
+    def _leave_cell(self, cell):
+        count = self.occupancy[cell] - 1
+        if count:
+            self.occupancy[cell] = count
+        else:
+            del self.occupancy[cell]
+
+    def enemy_added(self, enemy):
+        enemy.cell = cell_of(enemy.position)
+        self._enter_cell(enemy.cell)
+
+    def enemy_moved(self, enemy):
+        cell = cell_of(enemy.position)
+        if cell != enemy.cell:
+            self._leave_cell(enemy.cell)
+            enemy.cell = cell
+            self._enter_cell(cell)
+
+    def enemy_removed(self, enemy):
+        if enemy.cell is not None:
+            self._leave_cell(enemy.cell)
+            enemy.cell = None
+
+    def rebuild(self, towers, enemies):
+        # Used after the tower or enemy lists are replaced wholesale (e.g. loading a save)
+        self.clear()
+        for enemy in enemies:
+            self.enemy_added(enemy)
+        for tower in towers:
+            self.add_tower(tower)
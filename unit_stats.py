@@ -0,0 +1,70 @@
+import json
+import os
+from collections import namedtuple
+
+# Unit definitions live in units.json so balance changes don't need code edits.
+# They are compiled once at import into flat lookup tables with every global
+# modifier already applied, so entity constructors only copy values.
+UNITS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "units.json")
+
+TowerStats = namedtuple("TowerStats", [
+    "kind", "name", "damage", "range", "fire_rate", "cooldown_ms", "cost", "sell_value", "sprite"
+])
+EnemyStats = namedtuple("EnemyStats", [
+    "kind", "hp_by_wave", "speed", "damage", "reward", "sprite", "abilities"
+])
+
+def load_unit_definitions(path=UNITS_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compile_wave_scaling(waves):
+    # HP multiplier for wave-scaled enemies, indexed by wave number (0 = before wave 1)
+    scaling = []
+    for wave in range(waves["count"] + 1):
+        multiplier = 1.0 + (wave // waves["hp_growth_step"]) * waves["hp_growth_per_step"]
+        if wave > waves["late_game_wave"]:
+            multiplier *= waves["late_game_hp_multiplier"]
+        scaling.append(multiplier)
+    return tuple(scaling)
+
+def compile_tower_stats(towers, modifiers):
+    table = {}
+    for kind, unit in towers.items():
+        table[kind] = TowerStats(
+            kind=kind,
+            name=unit["name"],
+            damage=unit["damage"] * modifiers["tower_damage"],
+            range=unit["range"],
+            fire_rate=unit["fire_rate"],
+            cooldown_ms=unit["fire_rate"] * 1000,  # can_shoot compares against ms ticks
+            cost=unit["cost"],
+            sell_value=unit["cost"] // 2,  # Selling returns half the original cost
+            sprite=unit["sprite"]
+        )
+    return table
+
+def compile_enemy_stats(enemies, modifiers, wave_scaling):
+    table = {}
+    for kind, unit in enemies.items():
+        base_hp = unit["hp"] * modifiers["enemy_hp"]
+        if unit.get("wave_scaled", False):
+            hp_by_wave = tuple(base_hp * multiplier for multiplier in wave_scaling)
+        else:
+            hp_by_wave = (base_hp,) * len(wave_scaling)
+        table[kind] = EnemyStats(
+            kind=kind,
+            hp_by_wave=hp_by_wave,
+            speed=unit["speed"] * modifiers["enemy_speed"],
+            damage=unit["damage"],
+            reward=unit["reward"],
+            sprite=unit["sprite"],
+            abilities=unit.get("abilities", {})
+        )
+    return table
+
+_definitions = load_unit_definitions()
+MAX_WAVES = _definitions["waves"]["count"]
+WAVE_HP_SCALING = compile_wave_scaling(_definitions["waves"])
+TOWER_STATS = compile_tower_stats(_definitions["towers"], _definitions["modifiers"])
+ENEMY_STATS = compile_enemy_stats(_definitions["enemies"], _definitions["modifiers"], WAVE_HP_SCALING)
@@ -0,0 +1,139 @@
+import pygame
+from render_cache import load_sprite
+
+# The playfield is laid out in world coordinates (map pixels, see maps.json).
+# A camera picks the part of the world shown in the window and its zoom. The
+# world layer can also be drawn to a smaller internal surface and upscaled to
+# the window once per frame, which cuts fill cost on weak GPUs; the UI is
+# drawn afterwards at native resolution so text stays crisp.
+RENDER_SCALES = (1.0, 0.85, 0.75, 0.6, 0.5)  # Steps used by dynamic resolution
+
+class Viewport:
+    # Maps world coordinates to the surface the world layer is drawn on:
+    # surface position = (world position - camera origin) * zoom * render scale
+    def __init__(self, scale=1.0, window_size=None):
+        self.window_size = window_size
+        self.origin = (0, 0)
+        self.zoom = 1.0
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        self.render_scale = scale
+        self._update()
+
+    def set_camera(self, origin, zoom):
+        self.origin = origin
+        self.zoom = zoom
+        self._update()
+
+    def _update(self):
+        self.scale = self.render_scale * self.zoom
+        # Draw code can skip all transform work when world and surface line up
+        self.native = self.scale == 1.0 and self.origin == (0, 0)
+
+    def point(self, position):
+        scale = self.scale
+        origin_x, origin_y = self.origin
+        return (int((position[0] - origin_x) * scale), int((position[1] - origin_y) * scale))
+
+    def length(self, value):
+        return max(1, int(value * self.scale))
+
+    def size(self, size):
+        return (self.length(size[0]), self.length(size[1]))
+
+    def sprite(self, filename, size=(40, 40)):
+        # Scaled copies are cached per size, so switching scale only loads once
+        return load_sprite(filename, self.size(size))
+
+    def to_world(self, window_position):
+        # Window pixels (e.g. the mouse) to world pixels
+        return (int(self.origin[0] + window_position[0] / self.zoom),
+                int(self.origin[1] + window_position[1] / self.zoom))
+
+    def visible_rect(self, margin=0):
+        # World area shown in the window, grown by margin on every side
+        width, height = self.window_size
+        return pygame.Rect(int(self.origin[0]) - margin, int(self.origin[1]) - margin,
+                           int(width / self.zoom) + 1 + 2 * margin, int(height / self.zoom) + 1 + 2 * margin)
+
+NATIVE_VIEW = Viewport()
+
+# Camera controls
+ZOOM_LEVELS = (0.5, 0.75, 1.0, 1.5, 2.0)  # Few fixed levels keep the sprite caches small
+PAN_SPEED = 600  # Window pixels per second while a pan key is held
+
+class Camera:
+    # Scroll position and zoom over a world that may be larger than the window.
+    # Zooming out stops once the whole world fits, so small maps stay put.
+    def __init__(self, window_size, world_size):
+        self.window_size = window_size
+        self.world_size = world_size
+        min_zoom = max(window_size[0] / world_size[0], window_size[1] / world_size[1])
+        self.zoom_levels = [zoom for zoom in ZOOM_LEVELS if zoom >= min_zoom] or [1.0]
+        self.zoom = 1.0 if 1.0 in self.zoom_levels else self.zoom_levels[0]
+        self.x = 0.0
+        self.y = 0.0
+
+    @property
+    def origin(self):
+        return (int(self.x), int(self.y))
+
+    def pan(self, dx, dy):
+        # dx, dy in window pixels
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self._clamp()
+
+    def zoom_at(self, window_position, steps):
+        # Step through the zoom levels, keeping the world point under the cursor in place
+        index = self.zoom_levels.index(self.zoom) + steps
+        zoom = self.zoom_levels[max(0, min(index, len(self.zoom_levels) - 1))]
+        world_x = self.x + window_position[0] / self.zoom
+        world_y = self.y + window_position[1] / self.zoom
+        self.zoom = zoom
+        self.x = world_x - window_position[0] / zoom
+        self.y = world_y - window_position[1] / zoom
+        self._clamp()
+
+    def _clamp(self):
+        max_x = max(0.0, self.world_size[0] - self.window_size[0] / self.zoom)
+        max_y = max(0.0, self.world_size[1] - self.window_size[1] / self.zoom)
+        self.x = min(max(self.x, 0.0), max_x)
+        self.y = min(max(self.y, 0.0), max_y)
+
+# Frame-time driven scale selection
+SMOOTHING = 0.1  # Weight of the newest frame in the moving average
+SETTLE_FRAMES = 30  # Frames to wait after a change before dropping further
+RAISE_AFTER_FRAMES = 120  # Going back up waits longer, so the scale doesn't flip-flop
+RAISE_BELOW = 0.6  # Step back up once frames use less than this share of the budget
+
+class DynamicResolution:
+    # Steps the internal render scale down while frames run over budget (boss
+    # waves with hundreds of sprites) and back up once there is headroom again
+    def __init__(self, budget_ms, max_scale=1.0, min_scale=0.5):
+        self.levels = [max_scale] + [scale for scale in RENDER_SCALES if min_scale <= scale < max_scale]
+        self.level = 0
+        self.budget_ms = budget_ms
+        self.average_ms = 0.0
+        self.frames_since_change = 0
+
+    @property
+    def scale(self):
+        return self.levels[self.level]
+
+    def record(self, frame_ms):
+        # Feed the work time of one frame; returns True when the scale changed
+        self.average_ms += (frame_ms - self.average_ms) * SMOOTHING
+        self.frames_since_change += 1
+        if self.frames_since_change < SETTLE_FRAMES:
+            return False
+        if self.average_ms > self.budget_ms and self.level < len(self.levels) - 1:
+            self.level += 1
+        elif (self.average_ms < self.budget_ms * RAISE_BELOW and self.level > 0
+                and self.frames_since_change >= RAISE_AFTER_FRAMES):
+            self.level -= 1
+        else:
+            return False
+        self.frames_since_change = 0
+        return True
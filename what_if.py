@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from placement_optimizer import candidate_positions, plan_score
+from render_cache import load_sprite
+from save_state import restore
+from simulation import HeadlessSimulation, fork_map
+from tower import TOWER_TYPES
+from unit_stats import TOWER_STATS, ENEMY_STATS
+
+# Answers "what should I buy right now?" for one game state. The state is
+# built once (from a save file or by replaying an optimizer plan), then every
+# single-tower purchase is played out from it in its own fork.
+
+def replay_plan(plan, waves, seed, budget):
+    # Plays the first `waves` waves of an optimizer plan; stops in wave prep
+    simulation = HeadlessSimulation(seed, cash=budget)
+    for wave in range(1, waves + 1):
+        for purchase in plan:
+            if purchase["wave"] == wave:
+                simulation.buy_tower(TOWER_TYPES[purchase["tower"]], (purchase["x"], purchase["y"]))
+        if simulation.run_wave() != "wave_prep":
+            break
+    return simulation
+
+def load_save(path, seed):
+    simulation = HeadlessSimulation(seed)
+    with open(path, "rb") as f:
+        restore(simulation.game_manager, f.read(), simulation.time)
+    # Saves taken mid-wave are played to the end of that wave first
+    if simulation.game_manager.game_state == "playing":
+        while simulation.game_manager.game_state == "playing":
+            simulation.step()
+    return simulation
+
+def warm_sprites():
+    # Load every sprite before forking so the children share the parent's copies
+    for stats in (*TOWER_STATS.values(), *ENEMY_STATS.values()):
+        load_sprite(stats.sprite)
+
+def purchase_options(simulation):
+    gm = simulation.game_manager
+    positions = candidate_positions(gm)
+    options = [None]  # Buying nothing is the baseline
+    for kind, tower_class in TOWER_TYPES.items():
+        if tower_class.stats.cost <= gm.cash:
+            options.extend((kind, x, y) for x, y in positions)
+    return options
+
+def play_out(horizon):
+    def evaluate(simulation, option):
+        gm = simulation.game_manager
+        start_wave = gm.current_wave
+        if option is not None:
+            kind, x, y = option
+            simulation.buy_tower(TOWER_TYPES[kind], (x, y))
+        for _ in range(horizon):
+            if simulation.run_wave() != "wave_prep":
+                break
+        cleared = gm.current_wave if gm.game_state in ("wave_prep", "victory") else gm.current_wave - 1
+        return {
+            "score": round(plan_score(cleared - start_wave, gm.base_hp), 3),
+            "waves_cleared": cleared - start_wave,
+            "base_hp": gm.base_hp,
+            "cash_left": gm.cash,
+        }
+    return evaluate
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare every possible tower purchase from one game state")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--save", metavar="PATH", help="start from a save or autosave file")
+    source.add_argument("--plan", metavar="PATH", help="start from a placement_optimizer.py results file")
+    parser.add_argument("--budget", type=int, default=500, help="budget entry of the plan to replay (default: 500)")
+    parser.add_argument("--rank", type=int, default=0, help="which layout of that budget to replay (default: 0, the best)")
+    parser.add_argument("--at-wave", type=int, default=1, help="replay the plan through this wave (default: 1)")
+    parser.add_argument("--horizon", type=int, default=5, help="waves to play after the purchase (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="game RNG seed (default: 0)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="forked evaluations running at once (default: one per CPU)")
+    parser.add_argument("--top", type=int, default=10, help="options to print (default: 10)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.save:
+        simulation = load_save(args.save, args.seed)
+    else:
+        with open(args.plan) as f:
+            plan = json.load(f)[str(args.budget)][args.rank]["purchases"]
+        simulation = replay_plan(plan, args.at_wave, args.seed, args.budget)
+
+    gm = simulation.game_manager
+    if gm.game_state != "wave_prep":
+        print(f"Nothing to decide: the game is in state '{gm.game_state}'")
+        return
+    options = purchase_options(simulation)
+    print(f"Wave {gm.current_wave}, cash {gm.cash}, base HP {gm.base_hp}: "
+          f"evaluating {len(options)} options over {args.horizon} waves")
+
+    warm_sprites()
+    start = time.perf_counter()
+    results = fork_map(simulation, play_out(args.horizon), options, args.workers)
+    print(f"Evaluated in {time.perf_counter() - start:.1f}s")
+
+    # Between equally good options, the one that leaves more cash wins
+    ranked = sorted(((result, option) for result, option in zip(results, options) if result),
+                    key=lambda pair: (-pair[0]["score"], -pair[0]["cash_left"]))
+    for result, option in ranked[:args.top]:
+        label = "buy nothing" if option is None else f"{option[0]} at ({option[1]}, {option[2]})"
+        print(f"{label:<32} waves {result['waves_cleared']:>2}  HP {result['base_hp']:>3}  "
+              f"cash {result['cash_left']}")
+
+if __name__ == "__main__":
+    main()